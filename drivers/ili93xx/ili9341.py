@@ -85,6 +85,8 @@ class ILI9341(framebuf.FrameBuffer):
         self.mvb = memoryview(buf)
         super().__init__(buf, self.width, self.height, self.mode)
         self._linebuf = bytearray(self.width * 2)
+        self._mvlb = memoryview(self._linebuf)
+        self._urgent = None  # Area awaiting urgent transfer: x0, y0, x1, y1
         # Hardware reset
         self._rst(0)
         sleep_ms(50)
@@ -178,6 +180,46 @@ class ILI9341(framebuf.FrameBuffer):
             self._spi.write(lb)
         self._cs(1)
 
+    # Queue a rectangular area for transfer ahead of the bulk refresh, e.g. for
+    # input feedback. It is sent at the start of the next refresh segment, under
+    # the user lock, so the bus is never written from an input callback.
+    def urgent(self, x, y, w, h):
+        x0 = max(x, 0) & ~1  # Two pixels per byte
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        x1 += x1 & 1
+        y1 = min(y + h, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        if (u := self._urgent) is not None:  # Merge with pending area
+            x0 = min(x0, u[0])
+            y0 = min(y0, u[1])
+            x1 = max(x1, u[2])
+            y1 = max(y1, u[3])
+        self._urgent = (x0, y0, x1, y1)
+
+    @micropython.native
+    def _send_urgent(self):
+        x0, y0, x1, y1 = self._urgent
+        self._urgent = None
+        clut = ILI9341.lut
+        wd = self.width // 2
+        cm = self._gscale
+        n = (x1 - x0) // 2  # Bytes per row
+        lb = self._mvlb[: n * 4]
+        buf = self.mvb
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        self._wcd(b"\x2a", int.to_bytes(x0 << 16 | x1 - 1, 4, "big"))  # SET_COLUMN
+        self._wcd(b"\x2b", int.to_bytes(y0 << 16 | y1 - 1, 4, "big"))  # SET_PAGE
+        self._wcmd(b"\x2c")  # WRITE_RAM
+        self._dc(1)
+        self._cs(0)
+        for start in range(y0 * wd + x0 // 2, y1 * wd, wd):  # For each line
+            _lcopy(lb, buf[start:], clut, n, cm)  # Copy and map colors
+            self._spi.write(lb)
+        self._cs(1)
+
     def short_lock(self, v=None):
         if v is not None:
             self.lock_mode = v  # If set, user lock is passed to .do_refresh
@@ -208,6 +250,13 @@ class ILI9341(framebuf.FrameBuffer):
                 async with elock:
                     if self._spi_init:  # A callback was passed
                         self._spi_init(self._spi)  # Bus may be shared
+                    if self._urgent is not None:  # Preempt the bulk transfer
+                        self._send_urgent()
+                        # Resume at the current line
+                        self._wcd(b"\x2a", int.to_bytes(self.width, 4, "big"))  # SET_COLUMN
+                        self._wcd(b"\x2b", int.to_bytes(line << 16 | ht - 1, 4, "big"))  # SET_PAGE
+                        self._wcmd(b"\x2c")  # WRITE_RAM
+                        self._dc(1)
                     self._cs(0)
                     for start in range(wd * line, wd * (line + lines), wd):  # For each line
                         _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
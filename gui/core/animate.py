@@ -0,0 +1,148 @@
+# animate.py Frame synchronised animation of widget properties.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Active animations are updated in a single pass once per refresh, just before
+# stale widgets are redrawn. No tasks are used. An animation drives a function,
+# typically a widget's .value method, which is called only when the animated
+# value changes.
+
+from utime import ticks_ms, ticks_diff, ticks_add
+from gui.core.ugui import Screen
+
+_active = []  # Running animations, plus any stopped since the last pass
+
+
+def _update():
+    if not _active:
+        return
+    now = ticks_ms()
+    done = False
+    for a in _active:  # Animations started by callbacks are included
+        if a._running:
+            a._update(ticks_diff(now, a._t0))
+        done = done or not a._running
+    if done:
+        _active[:] = [a for a in _active if a._running]
+
+
+Screen._before.append(_update)
+
+
+# Easing functions map elapsed time 0..1 to progress 0..1
+def linear(t):
+    return t
+
+
+def ease_in(t):
+    return t * t
+
+
+def ease_out(t):
+    return t * (2 - t)
+
+
+def ease_in_out(t):
+    return 2 * t * t if t < 0.5 else -1 + (4 - 2 * t) * t
+
+
+class _Animation:
+    def __init__(self, func, loop, callback, args):
+        self.func = func
+        self.loop = loop
+        self.callback = callback
+        self.args = args
+        self._running = False
+        self._t0 = 0  # Start time
+        self._last = None  # Last value passed to func
+
+    def start(self):
+        self._t0 = ticks_ms()
+        self._last = None
+        if not self._running:
+            self._running = True
+            if self not in _active:
+                _active.append(self)
+        return self
+
+    def stop(self):
+        self._running = False
+
+    def __call__(self):  # Running status
+        return self._running
+
+    def _set(self, v):
+        if v != self._last:
+            self._last = v
+            self.func(v)
+
+    # Handle the end of a period. Return elapsed time in the current period or
+    # None if the animation has finished.
+    def _wrap(self, dt, period):
+        if dt < period:
+            return dt
+        if self.loop and period > 0:
+            n = dt // period
+            self._t0 = ticks_add(self._t0, n * period)
+            return dt - n * period
+        self._running = False
+        return None
+
+    def _finish(self, v):
+        self._set(v)
+        if self.callback is not None:
+            self.callback(self, *self.args)
+
+
+# Move a value from start to end over duration ms. Values may be int, float or
+# complex.
+class Tween(_Animation):
+    def __init__(self, func, start, end, duration, ease=linear, *, loop=False, callback=None, args=()):
+        super().__init__(func, loop, callback, args)
+        self.start_value = start
+        self.end_value = end
+        self.duration = duration
+        self.ease = ease
+
+    def _update(self, dt):
+        if (dt := self._wrap(dt, self.duration)) is None:
+            self._finish(self.end_value)
+        else:
+            s = self.start_value
+            self._set(s + (self.end_value - s) * self.ease(dt / self.duration))
+
+
+# Step through a sequence of (time_ms, value) keyframes with ascending times.
+# Each value is held until the next keyframe time. If interp is True numeric
+# values are interpolated linearly between keyframes. The last keyframe time
+# sets the length of the timeline.
+class Timeline(_Animation):
+    def __init__(self, func, keyframes, *, interp=False, loop=False, callback=None, args=()):
+        super().__init__(func, loop, callback, args)
+        if not keyframes:
+            raise ValueError("Timeline requires keyframes.")
+        self.keyframes = keyframes
+        self.interp = interp
+        self._i = 0  # Current keyframe
+
+    def start(self):
+        self._i = 0
+        return super().start()
+
+    def _update(self, dt):
+        kf = self.keyframes
+        if (dt := self._wrap(dt, kf[-1][0])) is None:
+            self._finish(kf[-1][1])
+            return
+        i = self._i
+        if dt < kf[i][0]:  # Timeline has wrapped
+            i = 0
+        while i < len(kf) - 1 and dt >= kf[i + 1][0]:
+            i += 1
+        self._i = i
+        t0, v = kf[i]
+        if self.interp and i < len(kf) - 1:
+            t1, v1 = kf[i + 1]
+            v += (v1 - v) * (dt - t0) / (t1 - t0)
+        self._set(v)
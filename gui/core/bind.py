@@ -0,0 +1,71 @@
+# bind.py Coalesce high frequency value updates to widgets.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A Binding accepts values at any rate. Only the latest value, or the minimum,
+# maximum or mean of the values received since the last refresh, is passed to
+# the widget. This happens once per refresh, just before stale widgets are
+# redrawn, so formatting and widget callbacks run at the refresh rate.
+
+from gui.core.ugui import Screen
+
+_pending = []  # Bindings holding values not yet applied
+
+
+def _apply():
+    while _pending:
+        _pending.pop()._apply()
+
+
+Screen._before.append(_apply)
+
+
+class Binding:
+    LATEST = 0
+    MIN = 1
+    MAX = 2
+    AVG = 3
+
+    # fmt may be a format string such as "{:5.1f}" or a function taking the
+    # value and returning the arg for widget.value().
+    def __init__(self, widget, mode=LATEST, fmt=None):
+        if not 0 <= mode <= 3:
+            raise ValueError("Invalid Binding mode.")
+        self.widget = widget
+        self.mode = mode
+        self.fmt = fmt
+        self._v = 0  # Latest, min, max or sum of values
+        self._n = 0  # No. of values received since last applied
+
+    def __call__(self, v):
+        mode = self.mode
+        if not self._n:
+            self._v = v
+            _pending.append(self)
+        elif mode == Binding.LATEST:
+            self._v = v
+        elif mode == Binding.MIN:
+            if v < self._v:
+                self._v = v
+        elif mode == Binding.MAX:
+            if v > self._v:
+                self._v = v
+        else:
+            self._v += v
+        self._n += 1
+
+    def _apply(self):
+        v = self._v
+        if self.mode == Binding.AVG:
+            v /= self._n
+        self._n = 0
+        if (fmt := self.fmt) is not None:
+            v = fmt.format(v) if isinstance(fmt, str) else fmt(v)
+        self.widget.value(v)
+
+    # Apply any pending value immediately.
+    def flush(self):
+        if self._n:
+            _pending.remove(self)
+            self._apply()
@@ -5,9 +5,14 @@
 from hardware_setup import SSD
 from gui.core.writer import CWriter
 
+lut_rgb = [None] * 16  # RGB values of colors defined in a LUT
+
 # Code can be portable between 4-bit and other drivers by calling create_color
 def create_color(idx, r, g, b):
-    return CWriter.create_color(SSD, idx, r, g, b)
+    c = CWriter.create_color(SSD, idx, r, g, b)
+    if hasattr(SSD, 'lut'):
+        lut_rgb[idx] = (r, g, b)
+    return c
 
 if hasattr(SSD, 'lut'):  # Colors defined by LUT
     BLACK = create_color(0, 0, 0, 0)
@@ -0,0 +1,87 @@
+# sprite.py Save-under support for widgets which draw moving elements such as
+# pointers over a static background.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Before a moving element is drawn the display area it will cover is copied to
+# a Sprite. When the element moves the area is restored, leaving the background
+# intact without redrawing it. Where sprites overlap they must be restored in
+# the reverse of the order in which they were saved.
+
+from framebuf import FrameBuffer, MONO_HLSB, GS2_HMSB, GS4_HMSB, GS8, RGB565
+from gui.core.ugui import ssd
+
+_fmt = None  # Save buffer format and bits per pixel
+
+
+# Return the framebuf format and bits per pixel of a buffer holding display
+# pixels. Bits per pixel are found by writing an out of range color to a pixel
+# and reading it back.
+def pixel_format():
+    global _fmt
+    if _fmt is None:
+        p = ssd.pixel(0, 0)
+        ssd.pixel(0, 0, 0xFFFF)
+        v = ssd.pixel(0, 0)
+        ssd.pixel(0, 0, p)
+        fmts = {1: (MONO_HLSB, 1), 3: (GS2_HMSB, 2), 0xF: (GS4_HMSB, 4), 0xFF: (GS8, 8)}
+        _fmt = fmts.get(v, (RGB565, 16))
+    return _fmt
+
+
+class Sprite:
+    # Args: maximum dimensions of a saved area
+    def __init__(self, width, height):
+        mode, bpp = pixel_format()
+        self._mode = mode
+        self._bpp = bpp
+        self._width = width
+        self._height = height
+        self._buf = bytearray(((width * bpp + 7) >> 3) * height)
+        self._fb = None  # FrameBuffer holding saved area
+        self._x = 0  # Saved area
+        self._y = 0
+        self._w = 0
+        self._h = 0
+
+    # Save a display area. Dimensions are clipped to the size of the Sprite.
+    def save(self, x, y, w, h):
+        w = min(w, self._width)
+        h = min(h, self._height)
+        fb = FrameBuffer(self._buf, w, h, self._mode)
+        fb.blit(ssd, -x, -y)
+        self._fb = fb
+        self._x = x
+        self._y = y
+        self._w = w
+        self._h = h
+
+    # Restore the saved area to the display.
+    def restore(self):
+        if self._fb is not None:
+            ssd.blit(self._fb, self._x, self._y)
+            self._fb = None
+
+    # Restore rows row to row + nrows - 1 of the saved area (relative to its
+    # top), retaining the saved data.
+    def restore_rows(self, row, nrows):
+        if self._fb is not None:
+            row = max(row, 0)
+            nrows = min(nrows, self._h - row)
+            if nrows > 0:
+                stride = (self._w * self._bpp + 7) >> 3  # Bytes per row
+                mv = memoryview(self._buf)[row * stride : (row + nrows) * stride]
+                ssd.blit(FrameBuffer(mv, self._w, nrows, self._mode), self._x, self._y + row)
+
+    # Forget the saved area, e.g. after the background has been redrawn.
+    def discard(self):
+        self._fb = None
+
+    # Save the bounding box of a set of points with a margin of pad pixels.
+    def save_points(self, points, pad=1):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x = min(xs) - pad
+        y = min(ys) - pad
+        self.save(x, y, max(xs) + pad - x + 1, max(ys) + pad - y + 1)
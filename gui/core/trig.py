@@ -0,0 +1,68 @@
+# trig.py Fixed point trigonometry for widgets which draw at an angle.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Angles are integers: a full circle is ANGLES units, measured anticlockwise
+# from the positive x axis. Sines are scaled by 2**14. A quarter wave table
+# holds the results so that drawing allocates no floats.
+
+from array import array
+from math import pi, sin
+from micropython import const
+import micropython
+
+ANGLES = const(4096)  # Angle units per revolution
+_QUARTER = const(1024)
+_ONE = const(16384)  # 1.0 scaled
+
+_SIN = array("h", (round(_ONE * sin(pi * n / (2 * _QUARTER))) for n in range(_QUARTER + 1)))
+
+
+# Convert an angle in radians (float) to angle units.
+def angle(rad):
+    return round(rad * ANGLES / (2 * pi))
+
+
+# Sine of angle a scaled by 2**14
+@micropython.viper
+def isin(a: int) -> int:
+    t = ptr16(_SIN)
+    a &= 4095
+    q = a >> 10  # Quadrant
+    i = a & 1023
+    if q == 0:
+        return t[i]
+    if q == 1:
+        return t[1024 - i]
+    if q == 2:
+        return 0 - t[i]
+    return 0 - t[1024 - i]
+
+
+@micropython.viper
+def icos(a: int) -> int:
+    return int(isin(a + 1024))
+
+
+# Integer r * sin(a) and r * cos(a), rounded
+@micropython.viper
+def rsin(r: int, a: int) -> int:
+    return (r * int(isin(a)) + 8192) >> 14
+
+
+@micropython.viper
+def rcos(r: int, a: int) -> int:
+    return (r * int(isin(a + 1024)) + 8192) >> 14
+
+
+# Integer square root (floor)
+def isqrt(n):
+    if n <= 0:
+        return 0
+    x = n
+    y = (x + 1) >> 1
+    while y < x:
+        x = y
+        y = (x + n // x) >> 1
+    return x
@@ -8,7 +8,6 @@
 # Now requires firmware >= V1.20
 
 import asyncio
-from time import ticks_diff, ticks_ms
 import gc
 from array import array
 import sys
@@ -16,6 +15,8 @@ from machine import Pin
 
 from gui.core.colors import *
 from gui.primitives import Pushbutton
+from gui.primitives.autorepeat import autorepeat
+from gui.primitives.dispatch import dispatcher
 
 if sys.implementation.version < (1, 20, 0):
     raise OSError("Firmware V1.20 or later required.")
@@ -36,6 +37,13 @@ async def _g():
 type_coro = type(_g())
 
 
+def _gf():
+    yield
+
+
+type_gen = type(_gf())
+
+
 def asyncio_running():
     try:
         _ = asyncio.current_task()
@@ -80,6 +88,9 @@ class Input:
         if prev is not None:
             self._prev = BTN(prev)
             self._prev.press_func(Screen.ctrl_move, (_PREV,))
+            if self._nb == 3:  # prev and next adjust values in adjust mode
+                self._prev.release_func(autorepeat.stop, (self._prev,))
+                self._next.release_func(autorepeat.stop, (self._next,))
         if encoder:
             _vb and print("Using encoder.")
             if incr is None or decr is None:
@@ -93,18 +104,22 @@ class Input:
             if incr is not None:
                 sup = BTN(incr)
                 sup.press_func(Screen.adjust, (sup, 1))
+                sup.release_func(autorepeat.stop, (sup,))  # End auto-repeat
             if decr is not None:
                 sdn = BTN(decr)
                 sdn.press_func(Screen.adjust, (sdn, -1))
+                sdn.release_func(autorepeat.stop, (sdn,))
 
     def precision(self, val):  # Also called by Screen.ctrl_move to cancel mode
+        old = self._precision
         if val:
             if self._nb == 3 and not self._adj:
                 self.adj_mode()
             self._precision = True
         else:
             self._precision = False
-        Screen.redraw_co()
+        if self._precision != old:  # Avoid redundant immediate redraw
+            Screen.redraw_co()
 
     def adj_mode(self, v=None):  # Set, clear or toggle adjustment mode
         if self._nb == 3:  # Called from menu and dropdown widgets
@@ -162,13 +177,15 @@ class InputEnc:
         Screen.sel_ctrl()
 
     def precision(self, val):  # Also called by Screen.ctrl_move to cancel mode
+        old = self._precision
         if val:
             if not self._adj:
                 self.adj_mode()
             self._precision = True
         else:
             self._precision = False
-        Screen.redraw_co()
+        if self._precision != old:  # Avoid redundant immediate redraw
+            Screen.redraw_co()
 
     # If v is None, toggle adjustment mode. Bool sets or clears
     def adj_mode(self, v=None):  # Set, clear or toggle adjustment mode
@@ -318,6 +335,11 @@ class Screen:
     is_shutdown = asyncio.Event()
     # The lock enables user code to synchronise refresh with a realtime process.
     rfsh_lock = asyncio.Lock()
+    _frame = asyncio.Event()  # Pulsed after each physical refresh
+    _before = []  # Functions run before stale controls are redrawn
+    cache_size = 0  # Max no. of cached instances: 0 disables the cache
+    _cache = []  # [key, instance] pairs, most recently used last
+    reuse = False  # A subclass setting this may be cached
     BACK = 0
     STACK = 1
     REPLACE = 2
@@ -332,33 +354,67 @@ class Screen:
             cls._value = val
         return cls._value
 
+    # Discard cached instances of a class, or all if None is passed.
+    @classmethod
+    def uncache(cls, cls_screen=None):
+        if cls_screen is None:
+            cls._cache.clear()
+        else:
+            cls._cache[:] = [e for e in cls._cache if e[0][0] is not cls_screen]
+
+    # Return a cached instance matching key or None. An instance which is in the
+    # current stack of screens, or is still being built, cannot be reused.
+    @classmethod
+    def _cached(cls, key, ins_old):
+        c = cls._cache
+        for n, e in enumerate(c):
+            if e[0] == key:
+                ins = e[1]
+                s = ins_old
+                while s is not None:
+                    if s is ins:
+                        return None
+                    s = s.parent
+                if not ins._ready:
+                    return None
+                c.append(c.pop(n))  # Now most recently used
+                return ins
+        return None
+
+    # Pause until the current refresh is complete. Widget changes made on return
+    # appear in the next frame.
+    @classmethod
+    async def frame(cls):
+        await cls._frame.wait()
+
     # Called by Input when status change needs redraw of current obj
     @classmethod
     def redraw_co(cls):
         if cls.current_screen is not None:
             obj = cls.current_screen.get_obj()
             if obj is not None:
-                obj.draw = True
+                obj.show_now()
 
+    # User input is ignored while a screen is being built.
     @classmethod
     def ctrl_move(cls, v):
-        if cls.current_screen is not None:
+        if (cs := cls.current_screen) is not None and cs._ready:
             display.ipdev.precision(False)  # Cancel precision mode
-            cls.current_screen.move(v)
+            cs.move(v)
 
     @classmethod
     def sel_ctrl(cls):
-        if cls.current_screen is not None:
+        if (cs := cls.current_screen) is not None and cs._ready:
             display.ipdev.precision(False)  # Cancel precision mode
-            cls.current_screen.do_sel()
+            cs.do_sel()
 
     # Adjust the value of a widget. If an encoder is used, button arg
     # is an int (discarded), val is the delta. If using buttons, 1st
     # arg is the button, delta is +1 or -1
     @classmethod
     def adjust(cls, button, val):
-        if cls.current_screen is not None:
-            cls.current_screen.do_adj(button, val)
+        if (cs := cls.current_screen) is not None and cs._ready:
+            cs.do_adj(button, val)
 
     # Move currency to a specific widget (e.g. ButtonList)
     @classmethod
@@ -370,7 +426,10 @@ class Screen:
     def show(cls, force):
         for obj in cls.current_screen.displaylist:
             if obj.visible:  # In a buttonlist only show visible button
-                if force or obj.draw:
+                if force:
+                    obj.damaged = True  # Screen has been cleared
+                    obj.show()
+                elif obj.draw:
                     obj.show()
 
     #  Asyncio should be running before we change screen. It may be running before
@@ -402,20 +461,42 @@ class Screen:
                     raise ValueError("Windows are modal.")
                 if mode == cls.REPLACE and isinstance(cls_new_screen, Window):
                     raise ValueError("Windows must be stacked.")
-                ins_new = cls_new_screen(*args, **kwargs)
-                if not len(ins_new.lstactive):
-                    raise ValueError("Screen has no active widgets.")
+                ins_new = key = None
+                if cls_new_screen.reuse and cls.cache_size:
+                    key = (cls_new_screen, tuple(args), kwargs)
+                    ins_new = cls._cached(key, ins_old)
+                reopen = ins_new is not None
+                if ins_new is None:
+                    ins_new = cls_new_screen(*args, **kwargs)
+                    # A progressive screen may add active widgets later
+                    if not (len(ins_new.lstactive) or ins_new._gen is not None):
+                        raise ValueError("Screen has no active widgets.")
+                    if key is not None:
+                        c = cls._cache
+                        c[:] = [e for e in c if e[0] != key]  # Replace any unusable entry
+                        c.append([key, ins_new])
+                        while len(c) > cls.cache_size:
+                            c.pop(0)  # Discard least recently used
             else:
                 raise ValueError("Must pass Screen class or subclass (not instance)")
             # REPLACE: parent of new screen is parent of current screen
             ins_new.parent = ins_old if mode == cls.STACK else ins_old.parent
         else:
             ins_new = cls_new_screen  # cls_new_screen is an object, not a class
+            reopen = True
         display.ipdev.adj_mode(False)  # Ensure normal mode
         cls.current_screen = ins_new
+        if reopen:  # Widgets may restart tasks cancelled on screen change
+            for obj in ins_new.displaylist:
+                obj.on_reopen()
         ins_new.on_open()  # Optional subclass method
         ins_new._do_open(ins_old)  # Clear and redraw
-        ins_new.after_open()  # Optional subclass method
+        if ins_new._gen is not None:  # Progressive screen is incomplete: (re)start build
+            ins_new._ready = False
+            # Cancelled on screen change. Runs .after_open when done.
+            ins_new._btask = ins_new.reg_task(ins_new._build(), True)
+        else:
+            ins_new.after_open()  # Optional subclass method
         if ins_old is None and running:  # Initialising when asyncio already running
             asyncio.create_task(cls.monitor())
 
@@ -451,6 +532,8 @@ class Screen:
         # Task cancellation and shutdown
         for task in mt:
             task.cancel()
+        autorepeat.cancel()
+        dispatcher.cancel()
         for entry in cls.current_screen.tasks:
             # Screen instance will be discarded: no need to worry about .tasks
             entry[0].cancel()
@@ -461,6 +544,7 @@ class Screen:
             ssd.fill(0)
             ssd.show()
         cls.current_screen = None  # Ensure another demo can run (??)
+        cls._cache.clear()
 
     # If the display driver has an async refresh method, determine the split
     # value which must be a factor of the height. In the unlikely event of
@@ -478,6 +562,8 @@ class Screen:
             if split == 1:
                 arfsh = False
         while True:
+            for func in cls._before:  # E.g. apply coalesced values
+                func()
             Screen.show(False)  # Update stale controls. No physical refresh.
             # Now perform physical refresh.
             # If there is no user locking, .rfsh_lock will be acquired immediately
@@ -494,6 +580,8 @@ class Screen:
                             await ssd.complete.wait()
                     else:
                         ssd.show()  # Synchronous (blocking) refresh.
+            cls._frame.set()  # Wake tasks awaiting .frame()
+            cls._frame.clear()
             await asyncio.sleep_ms(0)  # Let user code respond to lock release
 
     @classmethod
@@ -544,6 +632,14 @@ class Screen:
         self.col = 0
         Screen.current_screen = self
         self.parent = None
+        self._ready = True  # False while .build_gen is running
+        # Generator creating widgets of a progressive screen. None when complete.
+        self._gen = None
+        if hasattr(self, "build_gen"):
+            if not isinstance(g := self.build_gen(), type_gen):
+                raise ValueError("build_gen must be a generator.")
+            self._gen = g
+        self._btask = None
         if writer is not None:  # Special case of no active widgets (e.g. popup message)
             DummyWidget(writer, self)  # Invisible active widget
 
@@ -555,12 +651,51 @@ class Screen:
             dev.fill_rect(x0, y0, w, h, color_map[BG])  # Blank to screen BG
             for obj in [z for z in self.displaylist if z.overlaps(x0, y0, x1, y1)]:
                 if obj.visible:
+                    obj.damaged = True
                     obj.show()
         # Normally clear the screen and redraw everything
         else:
             dev.clr_scr()  # Clear framebuf but don't update display
             Screen.show(True)  # Force full redraw
 
+    # Run the optional .build_gen generator. Each iteration creates a batch of
+    # widgets which are drawn before yielding to other tasks. Building stops if
+    # the screen ceases to be current and resumes when it is reopened.
+    async def _build(self):
+        dl = self.displaylist
+        n = len(dl)  # Widgets drawn by ._do_open
+        gen = self._gen
+        task = self._btask  # This task
+        try:
+            while Screen.current_screen is self:
+                try:
+                    next(gen)
+                except StopIteration:
+                    self._gen = None
+                while n < len(dl):
+                    if (obj := dl[n]).visible:
+                        obj.damaged = True
+                        obj.show()
+                    n += 1
+                if self._gen is None:
+                    break
+                await asyncio.sleep_ms(0)
+        except Exception:
+            self._gen = None  # Abandon a failed build
+            raise
+        finally:
+            if self._btask is task:  # Not superseded by a restarted build
+                self._ready = True  # Never leave input disabled
+                # Deregister: .after_open may change screen
+                self.tasks[:] = [e for e in self.tasks if e[0] is not task]
+        if self._gen is None:
+            if not len(self.lstactive):  # Nothing can take focus: abandon screen
+                c = Screen._cache
+                c[:] = [e for e in c if e[1] is not self]
+                Screen.back()
+            else:
+                self.after_open()
+
     # Return an active control or None
     # By default returns the selected control
     # else checks a given control by index into lstactive
@@ -600,9 +735,9 @@ class Screen:
                         self.selected_obj = idx
                         if lo is not None:
                             lo.leave()  # Tell object it's losing currency.
-                            lo.show()  # Re-display with new status
+                            lo.show_now()  # Re-display with new status
                         co.enter()  # Tell object it has currency
-                        co.show()
+                        co.show_now()
                     done = True
 
     # Move currency to a specific control.
@@ -614,9 +749,9 @@ class Screen:
                 self.selected_obj = idx
                 if lo is not None:
                     lo.leave()  # Tell object it's losing currency.
-                    lo.show()  # Re-display with new status
+                    lo.show_now()  # Re-display with new status
                 co.enter()  # Tell object it has currency
-                co.show()
+                co.show_now()
                 return True  # Success
         return False
 
@@ -742,6 +877,9 @@ class Widget:
         self.mcol = col + width + 2
         self.visible = True  # Used by ButtonList class for invisible buttons
         self.draw = True  # Signals that obect must be redrawn
+        # Set when the object's screen area has been overwritten. Widgets which
+        # can redraw part of themselves must then perform a full redraw.
+        self.damaged = True
         self._value = value
 
         # Set colors. Writer colors cannot be None:
@@ -785,6 +923,20 @@ class Widget:
     def __call__(self, val=None):
         return self.value(val)
 
+    # Redraw in response to user input. If the driver supports it, the area is
+    # sent to the display ahead of the next refresh segment rather than awaiting
+    # completion of a full refresh.
+    def show_now(self):
+        self.show()
+        if self.screen is Screen.current_screen and hasattr(ssd, "urgent"):
+            ssd.urgent(self.col - 2, self.row - 2, self.width + 4, self.height + 4)
+
+    # Called when the widget's screen is displayed again after being overlaid
+    # or closed, before it is redrawn. Tasks registered with on_change True
+    # will have been cancelled: a widget may restart them here.
+    def on_reopen(self):
+        return
+
     # Some widgets (e.g. Dial) have an associated Label
     def text(self, text=None, invert=False, fgcolor=None, bgcolor=None, bdcolor=None):
         if hasattr(self, "label"):
@@ -798,6 +950,7 @@ class Widget:
             # Can occur if a control's action is to change screen.
             return False  # Subclass abandons
         self.draw = False
+        self.damaged = False
         self.draw_border()
         # Blank controls' space
         if self.visible:
@@ -889,6 +1042,8 @@ class Widget:
 # have do_up and do_down methods which adjust the control's value in a
 # time-dependent manner.
 class LinearIO(Widget):
+    curve = None  # Auto-repeat acceleration curve. None: service default.
+
     def __init__(
         self,
         writer,
@@ -918,18 +1073,12 @@ class LinearIO(Widget):
         d = self.min_delta * 0.1 if self.precision() else self.min_delta
         self.value(self.value() + val * d)
         if not display.ipdev.encoder():
-            asyncio.create_task(self.btnhan(button, val, d))
+            self.btnhan(button, val, d)
 
     # Handle increase and decrease buttons. Redefined by textbox.py, scale_log.py
-    async def btnhan(self, button, up, d):
+    def btnhan(self, button, up, d):
         maxd = self.max_delta if self.precision() else d * 4  # Why move fast in precision mode?
-        t = ticks_ms()
-        while button():
-            await asyncio.sleep_ms(0)  # Quit fast on button release
-            if ticks_diff(ticks_ms(), t) > 500:  # Button was held down
-                d = min(maxd, d * 2)
-                self.value(self.value() + up * d)
-                t = ticks_ms()
+        autorepeat.start(button, lambda d: self.value(self.value() + up * d), d, maxd, self.curve)
 
     # Get current status (also used by scale_log widget)
     def precision(self):
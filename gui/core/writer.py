@@ -1,6 +1,7 @@
 # writer.py Implements the Writer class.
 # Handles colour, word wrap and tab stops
 
+# V0.5.3 Oct 2026 Add render and blit_text for repeated display of a string.
 # V0.5.2 May 2025 Fix bug whereby glyph clipping might be attempted.
 # V0.5.1 Dec 2022 Support 4-bit color display drivers.
 # V0.5.0 Sep 2021 Color now requires firmware >= 1.17.
@@ -25,7 +26,7 @@
 import framebuf
 from uctypes import bytearray_at, addressof
 
-__version__ = (0, 5, 2)
+__version__ = (0, 5, 3)
 
 
 class DisplayState:
@@ -153,6 +154,28 @@ class Writer:
             self._printchar("\n")
             self._printline(rstr, invert)  # Recurse
 
+    # Render a single line of text to a MONO_HLSB FrameBuffer for fast repeated
+    # display with .blit_text. Returns None for an empty string.
+    def render(self, string):
+        font = self.font
+        wd = 0
+        for char in string:
+            wd += font.get_ch(char)[2]
+        if not wd:
+            return None
+        ht = font.height()
+        fb = framebuf.FrameBuffer(bytearray(((wd + 7) >> 3) * ht), wd, ht, framebuf.MONO_HLSB)
+        x = 0
+        for char in string:
+            glyph, char_height, char_width = font.get_ch(char)
+            fbc = framebuf.FrameBuffer(bytearray(glyph), char_width, char_height, self.map)
+            fb.blit(fbc, x, 0)
+            x += char_width
+        return fb
+
+    def blit_text(self, fb, col, row, *_):
+        self.device.blit(fb, col, row)
+
     def stringlen(self, string, oh=False):
         if not len(string):
             return 0
@@ -292,6 +315,12 @@ class CWriter(Writer):
         s.text_col += self.char_width
         self.cpos += 1
 
+    def blit_text(self, fb, col, row, fgcolor=None, bgcolor=None):
+        palette = self.device.palette
+        palette.bg(self.bgcolor if bgcolor is None else bgcolor)
+        palette.fg(self.fgcolor if fgcolor is None else fgcolor)
+        self.device.blit(fb, col, row, -1, palette)
+
     def setcolor(self, fgcolor=None, bgcolor=None):
         if fgcolor is None and bgcolor is None:
             self.fgcolor = self.def_fgcolor
@@ -215,6 +215,26 @@ class TSeq(Screen):
             t += 1
 
 
+class Decimate(Screen):
+    def __init__(self):
+        super().__init__()
+        self.g = CartesianGraph(wri, 2, 2, fgcolor=GREEN, gridcolor=LIGHTGREEN)
+        Label(wri, 100, 2, 'Decimation of data with gaps.')
+        fwdbutton(wri, 30, 130, EmptyScreen, 'Forward', GREEN)
+        CloseButton(wri)
+
+    def after_open(self):  # After graph has been drawn
+        def populate(phase):
+            n = 1000
+            for k in range(n + 1):
+                x = 2 * k / n - 1
+                # Discontinuity near x == 0
+                yield x, (0.8 * math.sin(30 * x + phase) if abs(x) > 0.05 else None)
+
+        Curve(self.g, YELLOW, populate(0), decimate=Curve.LTTB)
+        Curve(self.g, RED, populate(math.pi), decimate=Curve.MINMAX)
+
+
 class BaseScreen(Screen):
     def __init__(self):
         super().__init__()
@@ -227,6 +247,7 @@ class BaseScreen(Screen):
         d['Realtime polar'] = RTPolar
         d['Realtime rect'] = RTRect
         d['Time sequence'] = TSeq
+        d['Decimation'] = Decimate
 
         row = 2
         col = 2
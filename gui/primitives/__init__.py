@@ -26,11 +26,16 @@ def launch(func, tup_args):
 
 
 _attrs = {
+    "AutoRepeat": "autorepeat",
     "Delay_ms": "delay_ms",
+    "Dispatcher": "dispatch",
+    "defer": "dispatch",
     "Encoder": "encoder",
+    "Feed": "feed",
     "Pushbutton": "pushbutton",
     "ESP32Touch": "pushbutton",
     "Switch": "switch",
+    "TStore": "tstore",
     "VButton": "virt_button",
 }
 
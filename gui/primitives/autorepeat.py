@@ -0,0 +1,88 @@
+# autorepeat.py Auto-repeat service for pushbuttons which are held down.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A single task serves the whole GUI: only one button can be held at a time.
+# The task waits on an Event when idle and sleeps until the next repeat is due
+# when a button is held, so holding a button does not hog the scheduler.
+# Repeating stops when .stop() is called from a button's release callback. If
+# a release is not signalled the button state is checked before each repeat.
+
+import asyncio
+from utime import ticks_add, ticks_diff, ticks_ms
+
+# An acceleration curve is a sequence of (delay_ms, multiplier) pairs. Entry n
+# governs repeat n: after delay_ms the step is multiplied by multiplier (subject
+# to the maximum step) and the callback runs. The last entry applies to all
+# subsequent repeats. The default doubles the step every 500ms.
+DEFAULT = ((500, 2),)
+
+
+class AutoRepeat:
+    def __init__(self):
+        self._evt = asyncio.Event()
+        self._task = None
+        self._button = None  # Button currently held
+        self._func = None
+        self._step = 0
+        self._max = 0
+        self._curve = DEFAULT
+        self._n = 0  # No. of repeats so far
+        self._tnext = 0  # Time of next repeat
+
+    # Call func(step) periodically while button is held. Any repeat already in
+    # progress is cancelled.
+    def start(self, button, func, step, maxstep, curve=None):
+        self._button = button
+        self._func = func
+        self._step = step
+        self._max = maxstep
+        self._curve = DEFAULT if curve is None else curve
+        self._n = 0
+        self._tnext = ticks_add(ticks_ms(), self._curve[0][0])
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._evt.set()
+
+    # Stop repeating. If a button is passed, only stop if it is the one held.
+    def stop(self, button=None):
+        if button is None or button is self._button:
+            self._button = None
+            self._func = None
+
+    def cancel(self):  # Stop the task on GUI shutdown
+        self.stop()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def __call__(self):  # Running status
+        return self._button is not None
+
+    async def _run(self):
+        evt = self._evt
+        try:
+            while True:
+                await evt.wait()  # Idle until a button is pressed
+                evt.clear()
+                while (button := self._button) is not None:
+                    dt = ticks_diff(self._tnext, ticks_ms())
+                    if dt > 0:
+                        await asyncio.sleep_ms(dt)
+                        continue  # .start or .stop may have run
+                    if not button():  # Release was not signalled
+                        self.stop()
+                        break
+                    curve = self._curve
+                    n = self._n
+                    self._n = n + 1
+                    mul = curve[min(n, len(curve) - 1)][1]
+                    self._step = min(self._max, self._step * mul)
+                    self._tnext = ticks_add(ticks_ms(), curve[min(n + 1, len(curve) - 1)][0])
+                    self._func(self._step)
+        finally:
+            self._task = None  # A failing callback does not stop future use
+
+
+autorepeat = AutoRepeat()
@@ -0,0 +1,107 @@
+# dispatch.py Deferred execution of widget callbacks.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A callback wrapped with defer() is queued rather than run when the widget
+# calls it. A single task runs queued callbacks in order of arrival. After
+# running callbacks for .budget ms it yields to the scheduler, so slow user
+# code does not hold up button handling or refresh. A coalescing callback that
+# is queued again for the same widget before it has run only runs once, with
+# the latest args. An exception in a callback is printed and the remaining
+# queue is processed.
+
+import asyncio
+import sys
+from utime import ticks_ms, ticks_us, ticks_diff
+from . import launch
+
+
+class Dispatcher:
+    def __init__(self, budget=10):
+        self.budget = budget  # ms per time slice
+        self._queue = []  # Entries are [func, args, key]
+        self._keys = {}  # Queued coalescing entries
+        self._evt = asyncio.Event()
+        self._task = None
+        self.reset()
+
+    # Clear metrics
+    def reset(self):
+        self.max_depth = 0  # Maximum queue length
+        self.calls = 0  # Callbacks run
+        self.coalesced = 0  # Callbacks merged with a queued one
+        self.max_us = 0  # Duration of slowest callback
+        self.total_us = 0  # Time spent in callbacks
+
+    def __len__(self):  # Current queue length
+        return len(self._queue)
+
+    # Queue func(*args). Entries with the same non-None key are coalesced.
+    def post(self, func, args, key=None):
+        if key is not None and (e := self._keys.get(key)) is not None:
+            e[1] = args
+            self.coalesced += 1
+            return
+        e = [func, args, key]
+        self._queue.append(e)
+        if key is not None:
+            self._keys[key] = e
+        self.max_depth = max(self.max_depth, len(self._queue))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._evt.set()
+
+    def cancel(self):  # Stop the task on GUI shutdown, discarding the queue
+        self._queue.clear()
+        self._keys.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        queue = self._queue
+        try:
+            while True:
+                await self._evt.wait()
+                self._evt.clear()
+                while queue:
+                    t = ticks_ms()
+                    while queue and ticks_diff(ticks_ms(), t) < self.budget:
+                        func, args, key = queue.pop(0)
+                        if key is not None:
+                            del self._keys[key]
+                        ts = ticks_us()
+                        try:
+                            launch(func, args)
+                        except Exception as e:  # Keep serving the queue
+                            print("Deferred callback", func, "failed:")
+                            sys.print_exception(e)
+                        dt = ticks_diff(ticks_us(), ts)
+                        self.calls += 1
+                        self.total_us += dt
+                        self.max_us = max(self.max_us, dt)
+                    await asyncio.sleep_ms(0)  # End of time slice
+        finally:
+            self._task = None  # Cancelled: the next .post restarts the task
+
+
+dispatcher = Dispatcher()
+
+
+class _Deferred:
+    def __init__(self, func, coalesce):
+        self.func = func
+        self.coalesce = coalesce
+
+    def __call__(self, *args):
+        # Widgets pass themselves as the first arg: coalesce per widget
+        key = ((self, args[0]) if args else self) if self.coalesce else None
+        dispatcher.post(self.func, args, key)
+
+
+# Wrap a callback so that it runs in the dispatcher task. If coalesce is True,
+# repeated calls from a widget are merged while queued: use this for value
+# change callbacks where only the latest value matters.
+def defer(func, coalesce=False):
+    return _Deferred(func, coalesce)
@@ -0,0 +1,71 @@
+# feed.py Interrupt-safe sample feed for graphs and meters.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# An ISR (which may be a hard IRQ) pushes integers into a preallocated ring
+# buffer and sets a ThreadSafeFlag. A single task wakes, waits for the end of
+# the current display refresh, then passes everything received to a callback
+# in one call. Pushing does not allocate. The ring buffer holds size - 1
+# samples: if the callback does not keep up, new samples are discarded and
+# counted.
+
+import asyncio
+from array import array
+from gui.core.ugui import Screen
+
+
+class Feed:
+    def __init__(self, size, func, *args):
+        self._buf = array("i", (0 for _ in range(size)))
+        self._out = array("i", self._buf)  # Samples in order of arrival
+        self._mv = memoryview(self._out)
+        self._size = size
+        self._wr = 0  # Updated only by .push
+        self._rd = 0  # Updated only by the task
+        self._func = func
+        self._args = args
+        self.overruns = 0
+        self._tsf = asyncio.ThreadSafeFlag()
+        self._task = asyncio.create_task(self._run())
+        if (s := Screen.current_screen) is not None:  # Cancel when it closes
+            s.reg_task(self._task)
+
+    # May be called from a hard IRQ
+    def push(self, v):
+        w = self._wr
+        n = w + 1
+        if n == self._size:
+            n = 0
+        if n == self._rd:  # Full
+            self.overruns += 1
+        else:
+            self._buf[w] = v
+            self._wr = n
+        self._tsf.set()
+
+    def __len__(self):  # No. of samples waiting
+        return (self._wr - self._rd) % self._size
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _run(self):
+        buf = self._buf
+        out = self._out
+        size = self._size
+        while True:
+            await self._tsf.wait()
+            await Screen.frame()  # Samples arriving meanwhile join this batch
+            w = self._wr  # May change while draining
+            r = self._rd
+            n = 0
+            while r != w:
+                out[n] = buf[r]
+                n += 1
+                r += 1
+                if r == size:
+                    r = 0
+            self._rd = r
+            if n:
+                self._func(self._mv[:n], *self._args)
@@ -0,0 +1,222 @@
+# tstore.py Flash backed time series store for graph plotting
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Samples are accumulated into buckets at each of a number of levels, e.g. 10s,
+# 1 minute and 1 hour. Each level is a ring of fixed size records in a single
+# file. A bucket's slot in the ring is determined by its time so no pointers
+# need be stored: a slot holding a record for a different time is empty.
+
+from struct import pack_into, unpack_from
+from array import array
+from micropython import const
+import time
+
+_MAGIC = b"TST1"
+_FMT = "<iifff"  # Record: bucket start time, sample count, min, mean, max
+_RSIZE = const(20)
+_NBUF = const(16)  # Records per file transfer
+
+
+class TStore:
+    MIN = 1  # Fields of records returned by .read()
+    AVG = 2
+    MAX = 3
+
+    def __init__(self, fname, levels=((10, 360), (60, 1440), (3600, 720)), overwrite=False):
+        nl = len(levels)
+        hdr = bytearray(8 + 8 * nl)
+        hdr[:4] = _MAGIC
+        pack_into("<I", hdr, 4, nl)
+        self._base = []  # File offset of each level
+        offs = len(hdr)
+        for n, (iv, size) in enumerate(levels):
+            if iv < 1 or size < 1 or (n and iv <= levels[n - 1][0]):
+                raise ValueError("Levels must have ascending intervals and nonzero size.")
+            pack_into("<II", hdr, 8 + 8 * n, iv, size)
+            self._base.append(offs)
+            offs += size * _RSIZE
+        self.levels = levels
+        self._rbuf = bytearray(_NBUF * _RSIZE)  # Used by .read
+        self._rmv = memoryview(self._rbuf)
+        self._sbuf = bytearray(_RSIZE)  # Used by ._seed while a read may be in progress
+        try:
+            f = open(fname, "r+b")
+        except OSError:  # No file: create it
+            f = None
+        if f is not None and f.read(len(hdr)) != hdr:  # Different configuration
+            f.close()
+            if not overwrite:
+                raise ValueError("File does not match levels.")
+            f = None
+        if f is None:
+            f = open(fname, "w+b")
+            f.write(hdr)
+            buf = self._rbuf
+            for n in range(len(buf)):
+                buf[n] = 0xFF  # Time of -1 denotes an empty slot
+            n = offs - len(hdr)
+            while n > 0:
+                f.write(self._rmv[: min(n, len(buf))])
+                n -= len(buf)
+            f.flush()
+        self._f = f
+        # Accumulators for each level: current bucket, count, min, sum, max.
+        self._bkt = array("i", (-1 for _ in range(nl)))
+        self._cnt = array("i", (0 for _ in range(nl)))
+        self._min = array("f", (0 for _ in range(nl)))
+        self._sum = array("f", (0 for _ in range(nl)))
+        self._max = array("f", (0 for _ in range(nl)))
+        # Write buffers: records for contiguous slots are written together.
+        self._wbuf = [bytearray(_NBUF * _RSIZE) for _ in range(nl)]
+        self._wslot = array("i", (0 for _ in range(nl)))  # Slot of first record
+        self._wn = array("i", (0 for _ in range(nl)))  # No. of records pending
+        self._t = None  # Time of last sample
+
+    def add(self, v, t=None):
+        self._sample(int(time.time()) if t is None else t, v)
+        self._commit()
+
+    # Bulk append of values sampled at intervals of dt secs starting at t
+    def extend(self, values, t, dt=1):
+        for n, v in enumerate(values):
+            self._sample(int(t + n * dt), v)
+        self._commit()
+
+    # Write incomplete buckets to flash, e.g. before a shutdown.
+    def flush(self):
+        for lvl in range(len(self.levels)):
+            if self._cnt[lvl]:
+                self._put(lvl)
+        self._commit()
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    # Choose the level to plot a time span on a graph of a given width. This is
+    # the coarsest level covering the span with at least one bucket per pixel. If
+    # there is none, the finest level covering the span is used.
+    def level(self, span, width):
+        best = None
+        for lvl, (iv, size) in enumerate(self.levels):
+            if iv * size >= span:
+                if best is None or iv * width <= span:
+                    best = lvl
+        return len(self.levels) - 1 if best is None else best
+
+    # Generator yielding (t, min, avg, max) for each bucket between times t0 and
+    # t1 inclusive, in time order. Empty buckets are skipped.
+    def read(self, t0, t1, level=0):
+        iv, size = self.levels[level]
+        self._write(level)
+        b = max(t0 // iv, t1 // iv - size + 1)  # Older buckets are overwritten
+        b1 = t1 // iv
+        cb = self._bkt[level]
+        f = self._f
+        buf = self._rbuf
+        while b <= b1:
+            if b == cb:  # Current bucket is in RAM
+                c = self._cnt[level]
+                if c:
+                    yield b * iv, self._min[level], self._sum[level] / c, self._max[level]
+                b += 1
+                continue
+            slot = b % size
+            nr = min(_NBUF, size - slot, b1 - b + 1)
+            if b < cb < b + nr:
+                nr = cb - b
+            f.seek(self._base[level] + slot * _RSIZE)
+            f.readinto(self._rmv[: nr * _RSIZE])
+            for n in range(nr):
+                t, c, mn, avg, mx = unpack_from(_FMT, buf, n * _RSIZE)
+                if c and t == (b + n) * iv:
+                    yield t, mn, avg, mx
+            b += nr
+
+    # Return a Curve plotting the most recent span seconds of data up to time t.
+    # The graph should have its x origin at the right hand side.
+    def curve(self, graph, color, span, *, t=None, field=AVG, level=None, yorigin=0, yexc=1):
+        from gui.widgets.graph import Curve
+        if t is None:
+            t = int(time.time())
+        if level is None:
+            level = self.level(span, graph.width)
+        return Curve(graph, color, self._populate(t - span, t, level, field),
+                     origin=(0, yorigin), excursion=(span, yexc))
+
+    def _populate(self, t0, t1, level, field):
+        iv = self.levels[level][0]
+        dt = iv / 2 - t1  # Plot at centre of bucket, relative to t1
+        last = None
+        for r in self.read(t0, t1, level):
+            if last is not None and r[0] - last > iv:
+                yield None, None  # Break the curve at a gap in the data
+            last = r[0]
+            yield r[0] + dt, r[field]
+
+    def _sample(self, t, v):
+        if self._t is not None and t < self._t:
+            raise ValueError("Timestamps must not decrease.")
+        self._t = t
+        for lvl, (iv, size) in enumerate(self.levels):
+            b = t // iv
+            if b != self._bkt[lvl]:
+                first = self._bkt[lvl] < 0
+                if self._cnt[lvl]:
+                    self._put(lvl)  # Bucket is complete
+                self._bkt[lvl] = b
+                self._cnt[lvl] = 0
+                if first:
+                    self._seed(lvl)
+            if self._cnt[lvl]:
+                self._min[lvl] = min(self._min[lvl], v)
+                self._max[lvl] = max(self._max[lvl], v)
+                self._sum[lvl] += v
+            else:
+                self._min[lvl] = v
+                self._max[lvl] = v
+                self._sum[lvl] = v
+            self._cnt[lvl] += 1
+
+    # Resume accumulating a bucket held on flash, e.g. after a reboot.
+    def _seed(self, lvl):
+        iv, size = self.levels[lvl]
+        b = self._bkt[lvl]
+        self._write(lvl)
+        self._f.seek(self._base[lvl] + (b % size) * _RSIZE)
+        self._f.readinto(self._sbuf)
+        t, c, mn, avg, mx = unpack_from(_FMT, self._sbuf, 0)
+        if c and t == b * iv:
+            self._cnt[lvl] = c
+            self._min[lvl] = mn
+            self._sum[lvl] = avg * c
+            self._max[lvl] = mx
+
+    # Queue a record for the current bucket of a level.
+    def _put(self, lvl):
+        iv, size = self.levels[lvl]
+        b = self._bkt[lvl]
+        slot = b % size
+        n = self._wn[lvl]
+        if n and (n == _NBUF or slot != self._wslot[lvl] + n):
+            self._write(lvl)
+            n = 0
+        if not n:
+            self._wslot[lvl] = slot
+        c = self._cnt[lvl]
+        pack_into(_FMT, self._wbuf[lvl], n * _RSIZE, b * iv, c, self._min[lvl], self._sum[lvl] / c, self._max[lvl])
+        self._wn[lvl] = n + 1
+
+    def _write(self, lvl):
+        n = self._wn[lvl]
+        if n:
+            self._f.seek(self._base[lvl] + self._wslot[lvl] * _RSIZE)
+            self._f.write(memoryview(self._wbuf[lvl])[: n * _RSIZE])
+            self._wn[lvl] = 0
+
+    def _commit(self):
+        for lvl in range(len(self.levels)):
+            self._write(lvl)
+        self._f.flush()
@@ -14,9 +14,11 @@ _attrs = {
     "Label": "label",
     "LED": "led",
     "Listbox": "listbox",
+    "Provider": "listbox",
     "SubMenu": "menu",
     "Menu": "menu",
     "Meter": "meter",
+    "BarGraph": "bargraph",
     "Region": "region",
     "ScaleLog": "scale_log",
     "Scale": "scale",
@@ -26,6 +28,7 @@ _attrs = {
     "BitMap": "bitmap",
     "QRMap": "qrcode",
     "Grid": "grid",
+    "Image": "image",
     }
 
 # Lazy loader, effectively does:
@@ -4,6 +4,7 @@
 # Copyright (c) 2021-2024 Peter Hinch
 
 from gui.core.ugui import LinearIO, display
+from gui.core.trig import angle, rsin, rcos
 from gui.widgets.label import Label
 import math
 
@@ -54,6 +55,9 @@ class Adjuster(LinearIO):
         self.xorigin = col + radius
         self.yorigin = row + radius
         self.color = color
+        self._arc = angle(self.arc)  # Integer geometry for pointer
+        self._xo = int(self.xorigin)
+        self._yo = int(self.yorigin)
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
@@ -69,12 +73,12 @@ class Adjuster(LinearIO):
             self._drawpointer(self._value, self.fgcolor)  # draw new
 
     def _drawpointer(self, value, color):
-        arc = self.arc
-        length = self.radius - 1
-        angle = value * arc - arc / 2
-        x_end = int(self.xorigin + length * math.sin(angle))
-        y_end = int(self.yorigin - length * math.cos(angle))
-        display.line(int(self.xorigin), int(self.yorigin), x_end, y_end, color)
+        arc = self._arc
+        length = int(self.radius - 1)
+        a = int(value * arc) - arc // 2
+        x0 = self._xo
+        y0 = self._yo
+        display.line(x0, y0, x0 + rsin(length, a), y0 - rcos(length, a), color)
 
 
 # This class combines an Adjuster with one or two labels. Numerous layout
@@ -0,0 +1,104 @@
+# bargraph.py Extension to ugui providing a multi-bar display widget, e.g. for
+# a spectrum analyser or a bank of VU meters.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Bar heights are held in arrays. An update redraws only the part of each bar
+# between its old and new heights, and peak markers that have moved. A full
+# redraw occurs only when the screen area has been overwritten.
+
+from array import array
+from gui.core.ugui import Widget, Screen, display
+from gui.core.colors import *
+
+
+class BarGraph(Widget):
+    def __init__(self, writer, row, col, nbars, *, height=50, barwidth=4, gap=1,
+                 fgcolor=None, bgcolor=BLACK, bdcolor=None, color=None,
+                 pkcolor=None, hold=10, decay=1, vmax=1):
+        width = nbars * (barwidth + gap) - gap
+        super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
+        self.nbars = nbars
+        self.barwidth = barwidth
+        self.pitch = barwidth + gap
+        self.color = self.fgcolor if color is None else color
+        self.pkcolor = pkcolor  # None: no peak markers
+        self.hold = hold  # Updates for which a peak is held before decaying
+        self.decay = decay  # Pixels per update
+        self.vmax = vmax
+        z = lambda: array("h", (0 for _ in range(nbars)))
+        self._new = z()  # Bar heights in pixels
+        self._old = z()  # Heights when last drawn
+        self._pk = z()  # Peak heights
+        self._pko = z()  # Peak heights when last drawn
+        self._cnt = z()  # Hold countdown
+        self._key = None  # Appearance when last drawn
+
+    # Update all bars from a sequence of values in range 0..vmax. Missing
+    # values are treated as 0. Returns bar heights in pixels.
+    def value(self, data=None):
+        if data is None:
+            return self._new
+        height = self.height
+        vmax = self.vmax
+        new = self._new
+        pk = self._pk
+        cnt = self._cnt
+        hold = self.hold
+        decay = self.decay
+        nd = len(data)
+        for i in range(self.nbars):
+            h = int(data[i] * height // vmax) if i < nd else 0
+            h = 0 if h < 0 else height if h > height else h
+            new[i] = h
+            if h >= pk[i]:  # New peak
+                pk[i] = h
+                cnt[i] = hold
+            elif cnt[i]:
+                cnt[i] -= 1
+            else:
+                pk[i] = max(h, pk[i] - decay)
+        self.draw = True
+        return new
+
+    def show(self):
+        if self.screen is not Screen.current_screen:
+            return
+        key = (self.fgcolor, self.bgcolor, self.color, self.pkcolor)
+        full = self.damaged or key != self._key
+        if full:
+            if not super().show(False):  # Clear working area to bgcolor
+                return
+            self._key = key
+        else:
+            self.draw = False
+            display.usegrey(False)
+        x = self.col
+        y1 = self.row + self.height  # Bottom of bars
+        bw = self.barwidth
+        bg = self.bgcolor
+        color = self.color
+        pkcolor = self.pkcolor
+        top = self.row
+        new = self._new
+        old = self._old
+        pk = self._pk
+        pko = self._pko
+        for i in range(self.nbars):
+            h = new[i]
+            if full:
+                display.fill_rect(x, y1 - h, bw, h, color)
+            elif h > (o := old[i]):  # Bar has grown
+                display.fill_rect(x, y1 - h, bw, h - o, color)
+            elif h < o:  # Bar has shrunk
+                display.fill_rect(x, y1 - o, bw, o - h, bg)
+            old[i] = h
+            if pkcolor is not None:
+                # Marker is the row above the peak height, clamped to the graph
+                yp = max(y1 - pk[i] - 1, top)
+                if not full and (ypo := max(y1 - pko[i] - 1, top)) != yp:  # Erase old marker
+                    display.hline(x, ypo, bw, color if ypo >= y1 - h else bg)
+                display.hline(x, yp, bw, pkcolor)
+                pko[i] = pk[i]
+            x += self.pitch
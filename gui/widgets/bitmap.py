@@ -2,45 +2,45 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2022 Peter Hinch
 
-# Graphics are files created by Linux bitmap utility.
-# Widget writes data direct to the FrameBuffer.
-# There is no scaling: declared size of the widget must exactly
-# match the size of the bitmap.
+# Graphics are files created by Linux bitmap utility or binary PBM files.
+# A file is converted once to a MONO_HLSB FrameBuffer which is rendered with a
+# palette blit. Widget dimensions must be an integer multiple of those of the
+# bitmap: the image is scaled to fit.
 
 from gui.core.ugui import Widget
 from gui.core.colors import *
 from gui.core.ugui import ssd
+import framebuf
+import os
+
+
+def _rev(b):  # Reverse bit order of a byte: XBM is LS bit first.
+    b = (b & 0xF0) >> 4 | (b & 0x0F) << 4
+    b = (b & 0xCC) >> 2 | (b & 0x33) << 2
+    return (b & 0xAA) >> 1 | (b & 0x55) << 1
 
 
 class BitMap(Widget):
 
-    def __init__(self, writer, row, col, height, width, *, fgcolor=None, bgcolor=None, bdcolor=RED):
+    def __init__(self, writer, row, col, height, width, *, fgcolor=None, bgcolor=None, bdcolor=RED, cache=False):
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
+        self._cache = cache  # Save converted XBM files as PBM
+        self._fb = None
 
     def show(self):
         if not super().show(True):  # Draw or erase border
             return
-        if self._value is None:
+        if self._fb is None:
+            return
+        if not hasattr(ssd, "palette"):  # Monochrome driver, e.g. Sharp
+            ssd.blit(self._fb, self.col, self.row)
             return
-        with open(self._value, "r") as f:
-            g = self._gen_bytes(f)
-            bit = 1
-            wrap = False
-            for row in range(self.height):
-                if not wrap:
-                    byte = next(g)  # Each row starts on a new byte
-                    bit = 1
-                for col in range(self.width):
-                    c = self.fgcolor if byte & bit else self.bgcolor
-                    ssd.pixel(self.col + col, self.row + row, c)
-                    wrap = (bit := bit << 1) == 0x100
-                    if wrap:
-                        byte = next(g)
-                        bit = 1
+        palette = ssd.palette
+        palette.bg(self.bgcolor)
+        palette.fg(self.fgcolor)
+        ssd.blit(self._fb, self.col, self.row, -1, palette)
 
     def _gen_bytes(self, f):  # Yield data bytes from file stream
-        f.readline()
-        f.readline()  # Advance file pointer to data start
         s = f.readline()
         if not s.startswith("static"):
             raise ValueError("Bad file format.")
@@ -60,17 +60,84 @@ class BitMap(Widget):
             raise ValueError("Bad file format.")
         return int(elements[2])
 
-    def _validate(self, fn):
-        if not isinstance(fn, str):
-            raise ValueError("Value must be a filename.")
+    def _read_xbm(self, fn):
         with open(fn, "r") as f:
             wd = self._get_dim(f, "width")
             ht = self._get_dim(f, "height")
-            if not (wd  == self.width and ht == self.height):
-                raise ValueError(f"Object dimensions {ht}x{wd} do not match widget {self.height}x{self.width}")
+            buf = bytearray(((wd + 7) >> 3) * ht)  # Rows are byte aligned
+            n = 0
+            for b in self._gen_bytes(f):
+                if n < len(buf):
+                    buf[n] = _rev(b)
+                n += 1
+        return buf, wd, ht
+
+    # The header comprises whitespace separated tokens "P4", width and height,
+    # optionally with comments. A single whitespace character precedes the data.
+    def _read_pbm(self, fn):
+        with open(fn, "rb") as f:
+            hdr = []
+            tok = b""
+            while len(hdr) < 3:
+                c = f.read(1)
+                if not c:
+                    raise ValueError("Bad file format.")
+                if c == b"#":  # Comment runs to end of line
+                    f.readline()
+                    c = b"\n"
+                if c in b" \t\r\n":
+                    if tok:
+                        hdr.append(tok)
+                        tok = b""
+                else:
+                    tok += c
+            if hdr[0] != b"P4":
+                raise ValueError("Bad file format.")
+            wd = int(hdr[1])
+            ht = int(hdr[2])
+            buf = bytearray(((wd + 7) >> 3) * ht)
+            f.readinto(buf)
+        return buf, wd, ht
+
+    # Return bitmap data in MONO_HLSB format, width and height. An XBM file
+    # may be cached in a PBM file which is used unless older than the source.
+    def _load(self, fn):
+        with open(fn, "rb") as f:
+            pbm = f.read(2) == b"P4"
+        if pbm:
+            return self._read_pbm(fn)
+        cfn = f"{fn}.pbm"
+        if self._cache:
+            try:
+                if os.stat(cfn)[8] >= os.stat(fn)[8]:
+                    return self._read_pbm(cfn)
+            except OSError:  # No cache file
+                pass
+        buf, wd, ht = self._read_xbm(fn)
+        if self._cache:
+            with open(cfn, "wb") as f:
+                f.write(f"P4\n{wd} {ht}\n".encode())
+                f.write(buf)
+        return buf, wd, ht
 
     def value(self, fn):
-        self._validate(fn)  # Throws on failure
+        if not isinstance(fn, str):
+            raise ValueError("Value must be a filename.")
+        buf, wd, ht = self._load(fn)  # Throws on failure
+        sy, ry = divmod(self.height, ht)
+        sx, rx = divmod(self.width, wd)
+        if rx or ry or not (sx and sy):
+            raise ValueError(f"Object dimensions {ht}x{wd} do not match widget {self.height}x{self.width}")
+        fb = framebuf.FrameBuffer(buf, wd, ht, framebuf.MONO_HLSB)
+        if sx > 1 or sy > 1:  # Scale by replicating pixels
+            src = fb
+            buf = bytearray(((self.width + 7) >> 3) * self.height)
+            fb = framebuf.FrameBuffer(buf, self.width, self.height, framebuf.MONO_HLSB)
+            for y in range(ht):
+                for x in range(wd):
+                    if src.pixel(x, y):
+                        fb.fill_rect(x * sx, y * sy, sx, sy, 1)
+        self._fb = fb
         super().value(fn)
 
     def color(self, fgcolor=None, bgcolor=None):
@@ -92,7 +92,7 @@ class Button(Widget):
         if self.litcolor is not None and self.has_focus():  # CB may have changed focus
             if self.bgcolor != self.litcolor:
                 self.bgcolor = self.litcolor
-                self.draw = True  # Redisplay
+                self.show_now()  # Immediate feedback
                 revert = asyncio.create_task(self.shownormal())
                 Screen.current_screen.reg_task(revert, True)  # Cancel on screen change
 
@@ -3,36 +3,47 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2020 Peter Hinch
 
+# If sprites is True the dial face is drawn only when the widget is first
+# displayed or its screen area has been overwritten. Pointers are drawn over it
+# as sprites: the area under each is saved and restored when it moves.
+
 import cmath
-from gui.core.ugui import Widget, display
+from gui.core.ugui import Widget, Screen, display
+from gui.core.sprite import Sprite
+from gui.core.trig import ANGLES, rsin, rcos, isqrt
 from gui.widgets.label import Label
 
-# Line defined by polar coords; origin and line are complex
-def polar(display, origin, line, color):
-    xs, ys = origin.real, origin.imag
-    theta = cmath.polar(line)[1]
-    display.line(round(xs), round(ys), round(xs + line.real), round(ys - line.imag), color)
+# Pixel coordinates use integer arithmetic. Vectors (dx, dy) are in pixels with
+# y increasing upwards.
 
-def conj(v):  # complex conjugate
-    return v.real - v.imag * 1j
+# Round n * m / d to nearest integer
+def _scale(n, m, d):
+    return (2 * n * m + d) // (2 * d)
 
-# Draw an arrow; origin and vec are complex, scalar lc defines length of chevron.
-# cw and ccw are unit vectors of +-3pi/4 radians for chevrons (precompiled)
-def arrow(display, origin, vec, lc, color, ccw=cmath.exp(3j * cmath.pi/4), cw=cmath.exp(-3j * cmath.pi/4)):
-    length, theta = cmath.polar(vec)
-    uv = cmath.rect(1, theta)  # Unit rotation vector
-    start = -vec
-    if length > 3 * lc:  # If line is long
-        ds = cmath.rect(lc, theta)
-        start += ds  # shorten to allow for length of tail chevrons
-    chev = lc + 0j
-    polar(display, origin, vec, color)  # Origin to tip
-    polar(display, origin, start, color)  # Origin to tail
-    polar(display, origin + conj(vec), chev*ccw*uv, color)  # Tip chevron
-    polar(display, origin + conj(vec), chev*cw*uv, color)
-    if length > lc:  # Confusing appearance of very short vectors with tail chevron
-        polar(display, origin + conj(start), chev*ccw*uv, color)  # Tail chevron
-        polar(display, origin + conj(start), chev*cw*uv, color)
+# Draw an arrow centred on xo, yo with its tip at dx, dy relative to the
+# origin. Scalar lc defines length of chevron.
+def arrow(display, xo, yo, dx, dy, lc, color):
+    length = isqrt(dx * dx + dy * dy)
+    tx = -dx  # Tail
+    ty = -dy
+    if length > 3 * lc:  # If line is long shorten to allow for length of tail chevrons
+        tx += _scale(lc, dx, length)
+        ty += _scale(lc, dy, length)
+    display.line(xo, yo, xo + dx, yo - dy, color)  # Origin to tip
+    display.line(xo, yo, xo + tx, yo - ty, color)  # Origin to tail
+    ux, uy, ul = (dx, dy, length) if length else (1, 0, 1)  # Direction of arrow
+    # Chevrons are at +-3pi/4 radians to the arrow. 11585 == 2**14 * sin(pi/4)
+    d = ul << 14
+    cx0 = _scale(lc * 11585, -ux - uy, d)
+    cy0 = _scale(lc * 11585, ux - uy, d)
+    cx1 = _scale(lc * 11585, uy - ux, d)
+    cy1 = _scale(lc * 11585, -ux - uy, d)
+    ends = ((dx, dy), (tx, ty)) if length > lc else ((dx, dy),)  # Confusing appearance of very short vectors with tail chevron
+    for x, y in ends:
+        x += xo
+        y = yo - y
+        display.line(x, y, x + cx0, y - cy0, color)
+        display.line(x, y, x + cx1, y - cy1, color)
 
 
 class Pointer:
@@ -41,6 +52,9 @@ class Pointer:
         dial.vectors.add(self)
         self.val = 0 + 0j
         self.color = None
+        self.sprite = None  # Allocated when first drawn
+        self.dx = 0  # Vector in pixels
+        self.dy = 0
 
     def value(self, v=None, color=None):
         if color is not None:
@@ -52,6 +66,9 @@ class Pointer:
                     self.val = v/l
                 else:
                     self.val = v
+                radius = self.dial.radius
+                self.dx = round(self.val.real * radius)
+                self.dy = round(self.val.imag * radius)
             else:
                 raise ValueError('Pointer value must be complex.')
         self.dial.draw = True
@@ -62,8 +79,12 @@ class Dial(Widget):
     COMPASS = 1
     def __init__(self, writer, row, col, *, height=100,
                  fgcolor=None, bgcolor=None, bdcolor=False, ticks=4,
-                 label=None, style=0, pip=None):
+                 label=None, style=0, pip=None, sprites=False):
         super().__init__(writer, row, col, height, height, fgcolor, bgcolor, bdcolor)
+        self.sprites = sprites  # False: redraw everything when a pointer moves
+        self._drawn = []  # Sprites in the order they were saved
+        self._key = None  # Appearance of face when last drawn
+        self._pipsprite = None
         self.style = style
         self.pip = self.fgcolor if pip is None else pip
         if label is not None:
@@ -79,30 +100,63 @@ class Dial(Widget):
         self.vectors = set()
 
     def show(self):
-        if super().show():
-            # cache bound variables
-            ticks = self.ticks
-            radius = self.radius
-            xo = self.xorigin
-            yo = self.yorigin
-            # vectors (complex)
-            vor = xo + 1j * yo
-            vtstart = 0.9 * radius + 0j  # start of tick
-            vtick = 0.1 * radius + 0j  # tick
-            vrot = cmath.exp(2j * cmath.pi/ticks)  # unit rotation
-            for _ in range(ticks):
-                polar(display, vor + conj(vtstart), vtick, self.fgcolor)
-                vtick *= vrot
-                vtstart *= vrot
-            display.circle(xo, yo, radius, self.fgcolor)
-            vshort = 1000  # Length of shortest vector
-            for v in self.vectors:
-                color = self.fgcolor if v.color is None else v.color
-                val = v.value() * radius  # val is complex
-                vshort = min(vshort, cmath.polar(val)[0])
-                if self.style == Dial.CLOCK:
-                    polar(display, vor, val, color)
-                else:
-                    arrow(display, vor, val, 5, color)
-            if isinstance(self.pip, int) and vshort > 5:
-                display.fillcircle(xo, yo, 2, self.pip)
+        if self.screen is not Screen.current_screen:
+            return
+        # cache bound variables
+        radius = self.radius
+        xo = self.xorigin
+        yo = self.yorigin
+        drawn = self._drawn
+        key = (self.fgcolor, self.bgcolor, self.pip, self.ticks, self.style)
+        if self.sprites and not self.damaged and key == self._key:
+            self.draw = False
+            display.usegrey(False)
+            while drawn:  # Erase pointers
+                drawn.pop().restore()
+        else:
+            if not super().show():
+                return
+            for sprite in drawn:
+                sprite.discard()
+            drawn.clear()
+            self._key = key
+            self._face()
+        clock = self.style == Dial.CLOCK
+        vshort = 1000000  # Squared length of shortest vector
+        for v in self.vectors:
+            color = self.fgcolor if v.color is None else v.color
+            dx = v.dx
+            dy = v.dy
+            vshort = min(vshort, dx * dx + dy * dy)
+            if self.sprites:
+                if (sprite := v.sprite) is None:  # Pointer extends from the centre or through it
+                    size = radius + 3 if clock else 2 * radius + 13
+                    sprite = v.sprite = Sprite(size, size)
+                tip = (xo + dx, yo - dy)
+                if clock:
+                    sprite.save_points(((xo, yo), tip))
+                else:  # Allow for tail and chevrons
+                    sprite.save_points((tip, (xo - dx, yo + dy)), 6)
+                drawn.append(sprite)
+            if clock:
+                display.line(xo, yo, xo + dx, yo - dy, color)
+            else:
+                arrow(display, xo, yo, dx, dy, 5, color)
+        if isinstance(self.pip, int) and vshort > 25:
+            if self.sprites:
+                if (sprite := self._pipsprite) is None:
+                    sprite = self._pipsprite = Sprite(5, 5)
+                sprite.save(xo - 2, yo - 2, 5, 5)
+                drawn.append(sprite)
+            display.fillcircle(xo, yo, 2, self.pip)
+
+    def _face(self):
+        ticks = self.ticks
+        radius = self.radius
+        xo = self.xorigin
+        yo = self.yorigin
+        rs = (9 * radius + 5) // 10  # Start of tick
+        for tick in range(ticks):
+            a = tick * ANGLES // ticks
+            display.line(xo + rcos(rs, a), yo - rsin(rs, a), xo + rcos(radius, a), yo - rsin(radius, a), self.fgcolor)
+        display.circle(xo, yo, radius, self.fgcolor)
@@ -11,6 +11,8 @@ from gui.widgets.buttons import Button, CloseButton
 dolittle = lambda *_ : None
 
 class DialogBox(Window):
+    reuse = True  # May be cached if Screen.cache_size > 0
+
     def __init__(self, writer, row=20, col=20, *, elements, label=None,
                  bgcolor=DARKGREEN, buttonwidth=25, closebutton=True, callback=dolittle, args=[]):
 
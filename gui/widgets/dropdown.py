@@ -9,7 +9,7 @@
 from gui.core.ugui import Widget, display, Window, Screen
 from gui.core.colors import *
 
-from gui.widgets.listbox import Listbox
+from gui.widgets.listbox import Listbox, Provider
 
 dolittle = lambda *_: None
 
@@ -19,10 +19,14 @@ dolittle = lambda *_: None
 # This changes the DialogBox value, so its callback runs. This is the ._despatch method
 # which runs the callback of the currently selected element.
 class _ListDialog(Window):
+    reuse = True  # May be cached if Screen.cache_size > 0
+
     def __init__(self, writer, row, col, dd, dlines, els):  # dd is parent dropdown
         # Need to determine Window dimensions from size of Listbox, which
         # depends on number and length of elements.
         _, lb_height, dlines, tw = Listbox.dimensions(writer, els, dlines)
+        if tw is None:  # Provider with no width
+            tw = dd.textwidth + 4
         lb_width = tw + 2  # Text width + 2
         # Calculate Window dimensions
         ap_height = lb_height + 6  # Allow for listbox border
@@ -46,6 +50,10 @@ class _ListDialog(Window):
         )
         self.dd = dd
 
+    def on_open(self):  # A reused instance may hold a stale value
+        if isinstance(v := self.dd.value(), int) and v != self.listbox.value():
+            self.listbox._vchange(v)  # Scroll if necessary
+
     def callback(self, obj_listbox, update):
         display.ipdev.adj_mode(False)  # If in 3-button mode, leave adjust mode
         Screen.back()
@@ -82,7 +90,11 @@ class Dropdown(Widget):
         self.simple = isinstance(elements[0], str)
         self.els = elements  # Retain original
         if width is None:  # Allow for square at end for arrow
-            if self.simple:
+            if isinstance(elements, Provider):
+                if elements.width is None:
+                    raise ValueError("Provider has no width: width must be specified.")
+                self.textwidth = elements.width
+            elif self.simple:
                 self.textwidth = max(writer.stringlen(s) for s in elements)
             else:
                 self.textwidth = max(writer.stringlen(s[0]) for s in elements)
@@ -98,8 +110,11 @@ class Dropdown(Widget):
         super()._set_callbacks(callback, args)  # Callback runs on value change
 
     def update(self):  # Elements list has changed. Extract text component for dropdown.
+        if isinstance(self.els, Provider):
+            self.els.invalidate()
         # Ensure sensible _value if list size is reduced.
         self._value = min(self._value, len(self.els) - 1)
+        Screen.uncache(_ListDialog)  # Its Listbox was sized for the old list
         self.show()
 
     def show(self):
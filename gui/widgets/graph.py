@@ -4,9 +4,13 @@
 # Copyright (c) 2021 Peter Hinch
 
 from hardware_setup import ssd, display  # Create a display instance
-from gui.core.ugui import Widget
-from cmath import rect, pi
+from gui.core.ugui import Widget, Screen
+from gui.core.colors import *
+from gui.core.sprite import pixel_format
+from gui.core.trig import ANGLES, rsin, rcos
+from framebuf import FrameBuffer, GS8
 from micropython import const
+import micropython
 from array import array
 
 type_gen = type((lambda: (yield))())
@@ -16,23 +20,279 @@ _TOP = const(1)
 _BOTTOM = const(2)
 _LEFT = const(4)
 _RIGHT = const(8)
-# Bounding box for line clipping
-_XMAX = const(1)
-_XMIN = const(-1)
-_YMAX = const(1)
-_YMIN = const(-1)
+# Bulk plotting
+_CHUNK = const(32)  # Points scaled per pass
+_GUARD = const(8191)  # Scaled points are clamped to +-_GUARD pixels
+_NAN = const(-32768)  # Pixel value denoting a break in a curve
+_BIG = const(0x3fffffff)  # Length of a sequence of unknown length (generator)
+
+# Pixel buffers shared by all curves. Up to 5 points are carried from one chunk
+# to the next. _cbuf holds a line segment [0:4] and clip box [4:8].
+_px = array('h', (0 for _ in range(_CHUNK + 5)))
+_py = array('h', (0 for _ in range(_CHUNK + 5)))
+_cbuf = array('h', (0 for _ in range(8)))
+
+
+# Scaling functions. Args: x and y sources, start index, no. of points, pixel
+# buffers, buffer offset, transform. Results are stored in px[o:o + m], py[o:o + m].
+# Return the number of points stored: this is less than m if a generator ends.
+@micropython.native
+def _fscale(xs, ys, i, m, px, py, o, t):  # Indexable data
+    kx, bx, ky, by = t
+    for j in range(o, o + m):
+        x = xs[i]
+        y = ys[i]
+        i += 1
+        if x is None or y is None or x != x or y != y:  # NaN
+            px[j] = _NAN
+            py[j] = 0
+            continue
+        x = round(x * kx + bx)
+        y = round(y * ky + by)
+        px[j] = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+@micropython.native
+def _iscale(xs, ys, i, m, px, py, o, t):  # Integer arrays: fixed point arithmetic
+    kx, bx, ky, by, s = t
+    for j in range(o, o + m):
+        x = (xs[i] * kx + bx) >> s
+        y = (ys[i] * ky + by) >> s
+        i += 1
+        px[j] = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+@micropython.native
+def _gscale(xs, ys, i, m, px, py, o, t):  # Points selected by an index array
+    idx, kx, bx, ky, by = t
+    for j in range(o, o + m):
+        k = idx[i]
+        i += 1
+        x = xs[k]
+        y = ys[k]
+        if x != x or y != y:  # NaN
+            px[j] = _NAN
+            py[j] = 0
+            continue
+        x = round(x * kx + bx)
+        y = round(y * ky + by)
+        px[j] = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+@micropython.native
+def _pscale(gen, _, i, m, px, py, o, t):  # Generator yielding x, y pairs
+    kx, bx, ky, by = t
+    for j in range(o, o + m):
+        try:
+            x, y = next(gen)
+        except StopIteration:
+            return j - o
+        if x is None or y is None:
+            px[j] = _NAN
+            py[j] = 0
+            continue
+        x = round(x * kx + bx)
+        y = round(y * ky + by)
+        px[j] = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+@micropython.native
+def _zscale(zs, _, i, m, px, py, o, t):  # Iterator yielding complex
+    kx, bx, ky, by = t
+    for j in range(o, o + m):
+        try:
+            z = next(zs)
+        except StopIteration:
+            return j - o
+        if z is None:
+            px[j] = _NAN
+            py[j] = 0
+            continue
+        x = round(z.real * kx + bx)
+        y = round(z.imag * ky + by)
+        px[j] = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+@micropython.native
+def _tscale(data, _, i, m, px, py, o, t):  # TSequence ring buffer, newest first
+    cur, size, bx, dx, ky, by = t
+    for j in range(o, o + m):
+        x = round(bx + i * dx)
+        y = round(data[(cur - 1 - i) % size] * ky + by)
+        i += 1
+        px[j] = x
+        py[j] = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+    return m
+
+
+# Min/max (M4) decimation. Runs of consecutive points in the same pixel column
+# are replaced in place by their first, minimum, maximum and last points, in
+# their original order. Lines to adjacent columns are therefore unchanged.
+# Return the new number of points.
+@micropython.native
+def _minmax(px, py, n):
+    k = 0
+    j = 0
+    while j < n:
+        x = px[j]
+        f = j  # First
+        lo = j
+        hi = j
+        j += 1
+        while j < n and px[j] == x:
+            if py[j] < py[lo]:
+                lo = j
+            elif py[j] > py[hi]:
+                hi = j
+            j += 1
+        l = j - 1  # Last
+        a = lo if lo < hi else hi
+        b = hi if lo < hi else lo
+        yf = py[f]
+        ya = py[a]
+        yb = py[b]
+        yl = py[l]
+        px[k] = x
+        py[k] = yf
+        k += 1
+        if a != f:
+            px[k] = x
+            py[k] = ya
+            k += 1
+        if b != a:
+            px[k] = x
+            py[k] = yb
+            k += 1
+        if l != b:
+            px[k] = x
+            py[k] = yl
+            k += 1
+    return k
+
+
+# Largest Triangle Three Buckets. Select nb of the n points in xs, ys, storing
+# their indices in idx. Selection is unaffected by scaling so raw data is used.
+# NaN points (gaps) are ignored unless a bucket holds nothing else.
+@micropython.native
+def _lttb(xs, ys, n, idx, nb):
+    every = (n - 2) / (nb - 2)
+    a = 0
+    idx[0] = 0
+    for b in range(nb - 2):
+        s = int((b + 1) * every) + 1  # Average of next bucket
+        e = min(int((b + 2) * every) + 1, n)
+        xa = xs[a]
+        ya = ys[a]
+        ax = 0
+        ay = 0
+        c = 0
+        for k in range(s, e):
+            x = xs[k]
+            y = ys[k]
+            if x == x and y == y:
+                ax += x
+                ay += y
+                c += 1
+        if c:
+            ax /= c
+            ay /= c
+        else:
+            ax = xa
+            ay = ya
+        best = -1
+        sel = int(b * every) + 1
+        for k in range(sel, s):  # Current bucket. NaN area is never selected.
+            area = abs((xa - ax) * (ys[k] - ya) - (xa - xs[k]) * (ay - ya))
+            if area > best:
+                best = area
+                sel = k
+        idx[b + 1] = sel
+        a = sel
+    idx[nb - 1] = n - 1
+
+
+@micropython.native
+def _outcode(x, y, c):
+    oc = _TOP if y < c[5] else 0  # Pixel y increases downwards
+    oc |= _BOTTOM if y > c[7] else 0
+    oc |= _RIGHT if x > c[6] else 0
+    oc |= _LEFT if x < c[4] else 0
+    return oc
+
+
+# Integer Cohen–Sutherland clipping of the line segment in c[0:4] to the box
+# in c[4:8]. Return True if any part of the line is visible.
+@micropython.native
+def _iclip(c):
+    x0 = c[0]
+    y0 = c[1]
+    x1 = c[2]
+    y1 = c[3]
+    oc0 = _outcode(x0, y0, c)
+    oc1 = _outcode(x1, y1, c)
+    for _ in range(4):  # Integer rounding can leave a point just outside
+        if not oc0 | oc1:
+            c[0] = x0
+            c[1] = y0
+            c[2] = x1
+            c[3] = y1
+            return True
+        if oc0 & oc1:
+            return False
+        oc = oc0 if oc0 else oc1
+        if oc & _TOP:
+            y = c[5]
+            x = x0 + (y - y0) * (x1 - x0) // (y1 - y0)
+        elif oc & _BOTTOM:
+            y = c[7]
+            x = x0 + (y - y0) * (x1 - x0) // (y1 - y0)
+        elif oc & _RIGHT:
+            x = c[6]
+            y = y0 + (x - x0) * (y1 - y0) // (x1 - x0)
+        else:
+            x = c[4]
+            y = y0 + (x - x0) * (y1 - y0) // (x1 - x0)
+        if oc == oc0:
+            x0 = x
+            y0 = y
+            oc0 = _outcode(x0, y0, c)
+        else:
+            x1 = x
+            y1 = y
+            oc1 = _outcode(x1, y1, c)
+    return False
+
+
+# Draw n points of a polyline held in pixel buffers
+@micropython.native
+def _polyline(px, py, n, c, color):
+    line = ssd.line
+    for j in range(1, n):
+        if px[j - 1] == _NAN or px[j] == _NAN:
+            continue
+        c[0] = px[j - 1]
+        c[1] = py[j - 1]
+        c[2] = px[j]
+        c[3] = py[j]
+        if _iclip(c):
+            line(c[0], c[1], c[2], c[3], color)
 
 
 class Curve():
-    @staticmethod
-    def _outcode(x, y):
-        oc = _TOP if y > 1 else 0
-        oc |= _BOTTOM if y < -1 else 0
-        oc |= _RIGHT if x > 1 else 0
-        oc |= _LEFT if x < -1 else 0
-        return oc
-
-    def __init__(self, graph, color, populate=None, origin=(0, 0), excursion=(1, 1)):
+    MINMAX = 1  # Decimation options
+    LTTB = 2
+
+    def __init__(self, graph, color, populate=None, origin=(0, 0), excursion=(1, 1), decimate=0):
         if not isinstance(self, PolarCurve):  # Check not done in subclass
             if isinstance(graph, PolarGraph) or not isinstance(graph, CartesianGraph):
                 raise ValueError('Curve must use a CartesianGraph instance.')
@@ -40,11 +300,22 @@ class Curve():
         self.origin = origin
         self.excursion = excursion
         self.color = color if color is not None else graph.fgcolor
-        self.lastpoint = None
-        self.newpoint = None
+        self.decimate = decimate
+        self._idx = None  # LTTB index array
+        self._lx = _NAN  # Pixel coordinates of last point plotted by .point
+        self._ly = 0
+        self._tkey = None  # origin and excursion used to compute transforms
         if populate is not None and self._valid(populate):
-            for x, y in populate:
-                self.point(x, y)
+            if decimate == Curve.LTTB:  # Needs random access to the data
+                xs = array('f')
+                ys = array('f')
+                nan = float('nan')
+                for x, y in populate:
+                    xs.append(nan if x is None else x)
+                    ys.append(nan if y is None else y)
+                self.plot(xs, ys)
+            else:
+                self._draw(_pscale, populate, None, _BIG, self._tf())
 
     def _valid(self, populate):
         if not isinstance(populate, type_gen):
@@ -53,110 +324,186 @@ class Curve():
 
     def point(self, x=None, y=None):
         if x is None or y is None:
-            self.newpoint = None
-            self.lastpoint = None
+            self._lx = _NAN
             return
+        kx, bx, ky, by = self._tf()
+        self._seg(round(x * kx + bx), round(y * ky + by))
 
-        self.newpoint = self._scale(x, y)  # In-range points scaled to +-1 bounding box
-        if self.lastpoint is None:  # Nothing to plot. Save for next line.
-            self.lastpoint = self.newpoint
-            return
+    # Extend the line plotted by .point to pixel x, y, clipping to the graph.
+    def _seg(self, x, y):
+        x = _GUARD if x > _GUARD else -_GUARD if x < -_GUARD else x
+        y = _GUARD if y > _GUARD else -_GUARD if y < -_GUARD else y
+        if self._lx != _NAN:
+            g = self.graph
+            c = _cbuf
+            c[0] = self._lx
+            c[1] = self._ly
+            c[2] = x
+            c[3] = y
+            c[4] = g.x0
+            c[5] = g.y0
+            c[6] = g.x1
+            c[7] = g.y1
+            if _iclip(c):  # Ignore lines which don't intersect
+                ssd.line(c[0], c[1], c[2], c[3], self.color)
+        self._lx = x
+        self._ly = y
 
-        res = self._clip(*(self.lastpoint + self.newpoint))  # Clip to +-1 box
-        if res is not None:  # Ignore lines which don't intersect
-            self.graph.line(res[0:2], res[2:], self.color)
-        self.lastpoint = self.newpoint  # Scaled but not clipped
-
-    # Cohen–Sutherland line clipping algorithm
-    # If self.newpoint and self.lastpoint are valid clip them so that both lie
-    # in +-1 range. If both are outside the box return None.
-    def _clip(self, x0, y0, x1, y1):
-        oc1 = self._outcode(x0, y0)
-        oc2 = self._outcode(x1, y1)
-        while True:
-            if not oc1 | oc2:  # OK to plot
-                return x0, y0, x1, y1
-            if oc1 & oc2:  # Nothing to do
-                return
-            oc = oc1 if oc1 else oc2
-            if oc & _TOP:
-                x = x0 + (_YMAX - y0)*(x1 - x0)/(y1 - y0)
-                y = _YMAX
-            elif oc & _BOTTOM:
-                x = x0 + (_YMIN - y0)*(x1 - x0)/(y1 - y0)
-                y = _YMIN
-            elif oc & _RIGHT:
-                y = y0 + (_XMAX - x0)*(y1 - y0)/(x1 - x0)
-                x = _XMAX
-            elif oc & _LEFT:
-                y = y0 + (_XMIN - x0)*(y1 - y0)/(x1 - x0)
-                x = _XMIN
-            if oc is oc1:
-                x0, y0 = x, y
-                oc1 = self._outcode(x0, y0)
-            else:
-                x1, y1 = x, y
-                oc2 = self._outcode(x1, y1)
+    # Transforms are computed on first use and again only if .origin or
+    # .excursion is reassigned.
+    def _tf(self):
+        k = self._tkey
+        if k is None or k[0] is not self.origin or k[1] is not self.excursion:
+            self._tkey = (self.origin, self.excursion)
+            self._t = self._transform()
+            self._ft = self._fixed(self._t)
+        return self._t
 
-    def _scale(self, x, y):  # Scale to +-1.0
+    # Transform from data values to pixels: pixel = value * k + b
+    def _transform(self):
+        g = self.graph
         x0, y0 = self.origin
         xr, yr = self.excursion
-        xs = (x - x0) / xr
-        ys = (y - y0) / yr
-        return xs, ys
+        kx = g.x_axis_len / xr
+        ky = -g.y_axis_len / yr
+        return kx, g.xp_origin - x0 * kx, ky, g.yp_origin - y0 * ky
+
+    # Fixed point version of a transform for integer data
+    @staticmethod
+    def _fixed(t):
+        kx, bx, ky, by = t
+        s = 16
+        while s and max(abs(kx), abs(ky)) * (1 << s) >= 16384:  # Avoid long integers
+            s -= 1
+        f = 1 << s
+        h = f >> 1  # Round to nearest
+        return round(kx * f), round(bx * f) + h, round(ky * f), round(by * f) + h, s
+
+    # Plot up to n points in chunks. The last point of a chunk starts the next.
+    # When decimating, an incomplete pixel column is also carried forward.
+    def _draw(self, scale, xs, ys, n, t):
+        g = self.graph
+        c = _cbuf
+        c[4] = g.x0
+        c[5] = g.y0
+        c[6] = g.x1
+        c[7] = g.y1
+        color = self.color
+        dec = self.decimate
+        k = 0  # No. of points carried from the previous chunk
+        i = 0
+        while True:
+            r = min(_CHUNK, n - i)
+            m = scale(xs, ys, i, r, _px, _py, k, t)
+            i += m
+            np = k + m
+            if dec:
+                np = _minmax(_px, _py, np)
+            if m < r or i >= n:  # Done
+                _polyline(_px, _py, np, c, color)
+                if np:  # .point continues from the last point
+                    self._lx = _px[np - 1]
+                    self._ly = _py[np - 1]
+                break
+            j = np  # Start of incomplete column
+            if dec:
+                x = _px[np - 1]
+                j -= 1
+                while j and _px[j - 1] == x:
+                    j -= 1
+            if j:
+                _polyline(_px, _py, j, c, color)
+                j -= 1
+            k = 0
+            while j < np:
+                _px[k] = _px[j]
+                _py[k] = _py[j]
+                k += 1
+                j += 1
+
+    # Plot a curve from sequences of x and y values, typically arrays.
+    def plot(self, xs, ys):
+        n = min(len(xs), len(ys))
+        if n:
+            t = self._tf()
+            nb = self.graph.x1 - self.graph.x0  # Points retained by LTTB
+            if self.decimate == Curve.LTTB and n > nb > 2:
+                if self._idx is None or len(self._idx) != nb:
+                    self._idx = array('i', (0 for _ in range(nb)))
+                _lttb(xs, ys, n, self._idx, nb)
+                self._draw(_gscale, xs, ys, nb, (self._idx,) + t)
+            elif isinstance(xs, array) and isinstance(ys, array) and isinstance(xs[0] + ys[0], int):
+                self._draw(_iscale, xs, ys, n, self._ft)
+            else:
+                self._draw(_fscale, xs, ys, n, t)
 
 class PolarCurve(Curve): # Points are complex
-    def __init__(self, graph, color, populate=None):
+    def __init__(self, graph, color, populate=None, decimate=0):
         if not isinstance(graph, PolarGraph):
             raise ValueError('PolarCurve must use a PolarGraph instance.')
-        super().__init__(graph, color)
+        super().__init__(graph, color, decimate=decimate)
         if populate is not None and self._valid(populate):
-            for z in populate:
-                self.point(z)
+            self._draw(_zscale, populate, None, _BIG, self._tf())
 
     def point(self, z=None):
         if z is None:
-            self.newpoint = None
-            self.lastpoint = None
+            self._lx = _NAN
             return
+        kx, bx, ky, by = self._tf()
+        self._seg(round(z.real * kx + bx), round(z.imag * ky + by))
 
-        self.newpoint = self._scale(z.real, z.imag)  # In-range points scaled to +-1 bounding box
-        if self.lastpoint is None:  # Nothing to plot. Save for next line.
-            self.lastpoint = self.newpoint
-            return
+    def _transform(self):
+        g = self.graph
+        r = g.radius
+        return r, g.xp_origin, -r, g.yp_origin
 
-        res = self._clip(*(self.lastpoint + self.newpoint))  # Clip to +-1 box
-        if res is not None:  # At least part of line was in box
-            start = res[0] + 1j*res[1]
-            end = res[2] + 1j*res[3]
-            self.graph.cline(start, end, self.color)
-        self.lastpoint = self.newpoint  # Scaled but not clipped
+    # Plot a sequence of complex points or sequences of real and imaginary parts.
+    def plot(self, xs, ys=None):
+        if ys is not None:
+            super().plot(xs, ys)
+        elif len(xs):
+            self._draw(_zscale, iter(xs), None, len(xs), self._tf())
 
 
 class TSequence(Curve):
-    def __init__(self, graph, color, size, yorigin=0, yexc=1):
-        super().__init__(graph, color, origin=(0, yorigin), excursion=(1, yexc))
+    def __init__(self, graph, color, size, yorigin=0, yexc=1, decimate=0):
+        super().__init__(graph, color, origin=(0, yorigin), excursion=(1, yexc), decimate=decimate)
         self.data = array('f', (0 for _ in range(size)))
         self.cur = 0
         self.size = size
         self.count = 0
 
     def add(self, v):
-        p = self.cur
         size = self.size
         self.data[self.cur] = v
         self.cur += 1
         self.cur %= size
         if self.count < size:
             self.count += 1
-        x = 0
-        dx = 1/size
-        for _ in range(self.count):
-            self.point(x, self.data[p])
-            x -= dx
-            p -= 1
-            p %= size
-        self.point()
+        self._plot()
+
+    # Add a sequence of values, plotting the curve once.
+    def extend(self, values):
+        size = self.size
+        data = self.data
+        cur = self.cur
+        n = 0
+        for v in values:
+            data[cur] = v
+            cur += 1
+            if cur == size:
+                cur = 0
+            n += 1
+        self.cur = cur
+        self.count = min(self.count + n, size)
+        if n:
+            self._plot()
+
+    def _plot(self):
+        size = self.size
+        kx, bx, ky, by = self._tf()
+        # Plot from the most recent point at x == 0 back in time.
+        self._draw(_tscale, self.data, None, self.count, (self.cur, size, bx, -kx / size, ky, by))
 
 
 class Graph(Widget):
@@ -210,14 +557,6 @@ class CartesianGraph(Graph):
                     xpos = round(x0 + dx * line)
                     ssd.vline(xpos, y0, y1 - y0, color)
 
-    # Called by Curve
-    def line(self, start, end, color): # start and end relative to origin and scaled -1 .. 0 .. +1
-        xs = round(self.xp_origin + start[0] * self.x_axis_len)
-        ys = round(self.yp_origin - start[1] * self.y_axis_len)
-        xe = round(self.xp_origin + end[0] * self.x_axis_len)
-        ye = round(self.yp_origin - end[1] * self.y_axis_len)
-        ssd.line(xs, ys, xe, ye, color)
-
 class PolarGraph(Graph):
     def __init__(self, writer, row, col, *, height=90, fgcolor=None, bgcolor=None, bdcolor=None,
                  gridcolor=None, adivs=3, rdivs=4):
@@ -242,18 +581,141 @@ class PolarGraph(Graph):
                 for r in range(1, rdivs + 1):
                     display.circle(self.xp_origin, self.yp_origin, round(radius * r / rdivs), self.gridcolor)
             if adivs > 0:
-                v = complex(1)
-                m = rect(1, pi / adivs)
-                for _ in range(adivs):
-                    self.cline(-v, v, self.gridcolor)
-                    v *= m
+                xo = self.xp_origin
+                yo = self.yp_origin
+                for n in range(adivs):  # Lines through origin
+                    a = n * ANGLES // (2 * adivs)
+                    dx = rcos(radius, a)
+                    dy = rsin(radius, a)
+                    ssd.line(xo - dx, yo + dy, xo + dx, yo - dy, self.gridcolor)
             ssd.vline(x0 + radius, y0, diam, self.fgcolor)
             ssd.hline(x0, y0 + radius, diam, self.fgcolor)
 
-    def cline(self, start, end, color): # start and end are complex, 0 <= magnitude <= 1
-        height = self.radius  # Unit: pixels
-        xs = round(self.xp_origin + start.real * height)
-        ys = round(self.yp_origin - start.imag * height)
-        xe = round(self.xp_origin + end.real * height)
-        ye = round(self.yp_origin - end.imag * height)
-        ssd.line(xs, ys, xe, ye, color)
+
+# Waterfall mapping functions. Map n magnitudes in src to ramp indices in dst,
+# zeroing the rest of dst. par: vmin, vmax, scale factor (<< 16), max index,
+# signed flag, width.
+@micropython.viper
+def _map8(dst, src, n: int, par) -> int:
+    d = ptr8(dst)
+    s = ptr8(src)
+    p = ptr32(par)
+    lo = p[0]
+    hi = p[1]
+    k = p[2]
+    top = p[3]
+    sign = p[4]
+    w = p[5]
+    i = 0
+    while i < w:
+        v = lo
+        if i < n:
+            v = int(s[i])
+            if sign and v & 0x80:  # ptr8 reads are unsigned
+                v -= 0x100
+        d[i] = 0 if v <= lo else top if v >= hi else ((v - lo) * k) >> 16
+        i += 1
+    return 0
+
+
+@micropython.viper
+def _map16(dst, src, n: int, par) -> int:
+    d = ptr8(dst)
+    s = ptr16(src)
+    p = ptr32(par)
+    lo = p[0]
+    hi = p[1]
+    k = p[2]
+    top = p[3]
+    sign = p[4]
+    w = p[5]
+    i = 0
+    while i < w:
+        v = lo
+        if i < n:
+            v = int(s[i])
+            if sign and v & 0x8000:  # ptr16 reads are unsigned
+                v -= 0x10000
+        d[i] = 0 if v <= lo else top if v >= hi else ((v - lo) * k) >> 16
+        i += 1
+    return 0
+
+
+# Return the element size in bytes and signedness of a nonempty array.
+# MicroPython arrays have no .typecode or .itemsize, so a copy of one element
+# is probed. A value of -1 stored in it reads back as -1 only if the type is
+# signed. Storing -1 in an unsigned array truncates on MicroPython and raises
+# OverflowError on CPython.
+def _dtype(data):
+    p = data[:1]
+    size = len(bytes(p))
+    try:
+        p[0] = -1
+        signed = p[0] < 0
+    except OverflowError:
+        signed = False
+    return size, signed
+
+
+class Waterfall(Graph):
+    def __init__(self, writer, row, col, *, height=90, width=120, vmin=0, vmax=255, ramp=None,
+                 fgcolor=None, bgcolor=None, bdcolor=None):
+        super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor, None)
+        mode, bpp = pixel_format()
+        if bpp < 4:
+            raise ValueError('Waterfall requires a color display.')
+        # The graph area is addressed in place so the frame buffer must be
+        # horizontally mapped with rows of ssd.width pixels and no padding.
+        if len(memoryview(ssd)) != ssd.height * ((ssd.width * bpp + 7) >> 3):
+            raise ValueError('Waterfall: unsupported frame buffer layout.')
+        if (col * bpp) & 7:
+            raise ValueError('Waterfall col must be even on a 4-bit display.')
+        if vmax <= vmin:
+            raise ValueError('Waterfall vmax must exceed vmin.')
+        if ramp is None:
+            ramp = (BLACK, DARKBLUE, BLUE, CYAN, GREEN, YELLOW, RED, WHITE)
+        n = len(ramp)
+        if not 1 < n <= 256:
+            raise ValueError('Waterfall ramp must have 2 to 256 colors.')
+        # Palette maps ramp indices to colors in the display's format
+        self._pal = FrameBuffer(bytearray((n * bpp + 7) >> 3), n, 1, mode)
+        for i, c in enumerate(ramp):
+            self._pal.pixel(i, 0, c)
+        self._line = bytearray(width)  # Ramp indices of the new row
+        self._lfb = FrameBuffer(self._line, width, 1, GS8)
+        self._par = array('i', (vmin, vmax, ((n - 1) << 16) // (vmax - vmin), n - 1, 0, width))
+        self._data = None  # Last array appended
+        self._dtype = None  # Its element size and signedness
+        # A FrameBuffer sharing the display buffer but covering only the graph
+        # area allows the image to be scrolled in place.
+        w = ssd.width
+        offs = row * ((w * bpp + 7) >> 3) + ((col * bpp) >> 3)
+        self._view = FrameBuffer(memoryview(ssd)[offs:], width, height, mode, w)
+
+    # Scroll the image down by one row and draw data at the top. data is a
+    # bytearray or an array of type 'B', 'b', 'H' or 'h' holding a magnitude for
+    # each pixel column.
+    def append(self, data):
+        if self.screen is not Screen.current_screen:
+            return
+        n = len(data)
+        if isinstance(data, (bytes, bytearray)) or not n:
+            size = 1
+            signed = False
+        elif not isinstance(data, array):
+            raise ValueError('Waterfall data must be a bytearray or array.')
+        else:
+            if data is not self._data:  # Probing allocates: cache the result
+                self._dtype = _dtype(data)
+                self._data = data
+            size, signed = self._dtype
+        self._par[4] = signed
+        if size == 1:
+            _map8(self._line, data, n, self._par)
+        elif size == 2:
+            _map16(self._line, data, n, self._par)
+        else:
+            raise ValueError('Waterfall data must be 8 or 16 bit integers.')
+        v = self._view
+        v.scroll(0, 1)
+        v.blit(self._lfb, 0, 0, -1, self._pal)
@@ -1,24 +1,80 @@
-# grid.py micro-gui widget providing the Grid class: a 2d array of Label instances.
+# grid.py micro-gui widget providing the Grid class: a 2d array of text cells.
 
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2023 Peter Hinch
 
-from gui.core.ugui import Widget, display
-from gui.core.writer import Writer
+# Cell state is held in arrays rather than in a Label per cell. Changed cells
+# are flagged and the Grid redraws only those cells unless the screen area has
+# been overwritten.
+
+from array import array
+from micropython import const
+from gui.core.ugui import Widget, Screen, display
 from gui.core.colors import *
-from gui.widgets import Label
 from .parse2d import do_args
 
-# Given a slice and a maximum address return start and stop addresses (or None on error)
-# Step value must be 1, hence does not support start > stop (used with step < 0)
-def _do_slice(sli, nbytes):
-    if not (sli.step is None or sli.step == 1):
-        raise NotImplementedError("only slices with step=1 (or None) are supported")
-    start = sli.start if sli.start is not None else 0
-    stop = sli.stop if sli.stop is not None else nbytes
-    start = min(start if start >= 0 else max(nbytes + start, 0), nbytes)
-    stop = min(stop if stop >= 0 else max(nbytes + stop, 0), nbytes)
-    return (start, stop) if start < stop else None  # Caller should check
+_DIRTY = const(1)  # Cell flags
+_INVERT = const(2)
+
+
+# A Cell is a lightweight proxy for a grid cell. It supports the Label methods
+# .value and __call__ and read access to the Label attributes below. Reading
+# the value has no side effects.
+class Cell:
+    def __init__(self, grid, idx):
+        self.grid = grid
+        self.idx = idx
+
+    def value(self, text=None, invert=False, fgcolor=None, bgcolor=None, bdcolor=None, justify=None):
+        if text is None and not invert and fgcolor is None and bgcolor is None and justify is None:
+            return self.grid._text[self.idx]
+        return self.grid._set(self.idx, text, invert, fgcolor, bgcolor, justify=justify)
+
+    def __call__(self, text=None, invert=False, fgcolor=None, bgcolor=None, bdcolor=None, justify=None):
+        return self.value(text, invert, fgcolor, bgcolor, bdcolor, justify)
+
+    @property
+    def writer(self):
+        return self.grid.writer
+
+    @property
+    def row(self):
+        g = self.grid
+        return g.row + (self.idx // g.ncols) * g.cheight
+
+    @property
+    def col(self):
+        g = self.grid
+        return g._cx[self.idx % g.ncols]
+
+    @property
+    def tcol(self):  # Text x coordinate after justification
+        return self.grid._tcol[self.idx]
+
+    @property
+    def height(self):
+        return self.grid.writer.height
+
+    @property
+    def width(self):
+        g = self.grid
+        return g.cwidth[self.idx % g.ncols] - 4
+
+    @property
+    def fgcolor(self):
+        return self.grid._fg[self.idx]
+
+    @property
+    def bgcolor(self):
+        return self.grid._bg[self.idx]
+
+    @property
+    def invert(self):
+        return bool(self.grid._flags[self.idx] & _INVERT)
+
+    @property
+    def justify(self):
+        return self.grid.justify
 
 
 # lwidth may be integer Label width in pixels or a tuple/list of widths
@@ -50,22 +106,23 @@ class Grid(Widget):
         width = sum(self.cwidth) - 4  # Dimensions of widget interior
         height = nrows * self.cheight - 4
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
-        self.cells = []
-        r = row
-        c = col
-        for _ in range(self.nrows):
-            for cw in self.cwidth:
-                self.cells.append(
-                    Label(writer, r, c, cw - 4, invert, fgcolor, bgcolor, False, justify)
-                )  # No border
-                c += cw
-            r += self.cheight
-            c = col
+        self.justify = justify
+        self._cx = []  # Column x coordinates
+        c = self.col
+        for cw in self.cwidth:
+            self._cx.append(c)
+            c += cw
+        n = self.ncells
+        self._text = [None] * n
+        self._tcol = array("h", (self._cx[i % ncols] for i in range(n)))  # x of text
+        self._fg = array("i", (self.fgcolor for _ in range(n)))
+        self._bg = array("i", (self.bgcolor for _ in range(n)))
+        self._flags = bytearray((_INVERT if invert else 0) for _ in range(n))
 
     def __getitem__(self, *args):
         indices = do_args(args, self.nrows, self.ncols)
         for i in indices:
-            yield self.cells[i]
+            yield Cell(self, i)
 
     # allow grid[[r, c]] = "foo" or kwargs for Label:
     # grid[[r, c]] = {"text": str(n), "fgcolor" : RED}
@@ -79,21 +136,87 @@ class Grid(Widget):
                 pass  # Repeat last value
             except TypeError:
                 z = x
-            v = self.cells[i].value  # method of Label
-            _ = v(**z) if isinstance(x, dict) else v(z)
+            _ = self._set(i, **z) if isinstance(x, dict) else self._set(i, z)
+
+    def __call__(self, row, col=None):  # Return a single cell
+        return Cell(self, row if col is None else col + row * self.ncols)
+
+    # Bulk update of a row or column from a sequence of values, starting at a
+    # given column or row. Any kwargs (e.g. fgcolor) apply to every cell.
+    def row_values(self, row, values, col=0, **kwargs):
+        idx = row * self.ncols + col
+        for n, v in enumerate(values):
+            if col + n >= self.ncols:
+                break
+            self._set(idx + n, v, **kwargs)
+
+    def col_values(self, col, values, row=0, **kwargs):
+        for n, v in enumerate(values):
+            if row + n >= self.nrows:
+                break
+            self._set((row + n) * self.ncols + col, v, **kwargs)
 
-    def __call__(self, row, col=None):  # Return a single Label
-        return self.cells[row if col is None else col + row * self.ncols]
+    # Set text and appearance of a cell. As with Label.value, colors revert to
+    # the defaults unless specified.
+    def _set(self, i, text=None, invert=False, fgcolor=None, bgcolor=None, bdcolor=None, justify=None):
+        if text is not None:
+            x = self._cx[i % self.ncols]  # Default is left justify
+            width = self.cwidth[i % self.ncols] - 4
+            sl = self.writer.stringlen(text)
+            if justify is None:
+                justify = self.justify
+            if sl > width:  # Clip
+                font = self.writer.font
+                pos = 0
+                n = 0
+                for ch in text:
+                    pos += font.get_ch(ch)[2]  # width of current char
+                    if pos > width:
+                        break
+                    n += 1
+                text = text[:n]
+            elif justify == 1:  # Centre
+                x += (width - sl) // 2
+            elif justify == 2:  # Right
+                x += width - sl
+            self._text[i] = text
+            self._tcol[i] = x
+        self._fg[i] = self.fgcolor if fgcolor is None else fgcolor
+        self._bg[i] = self.bgcolor if bgcolor is None else bgcolor
+        self._flags[i] = (_INVERT if invert else 0) | _DIRTY
+        self.draw = True  # Redraw unconditionally: colors may have changed.
+        return self._text[i]
 
     def show(self):
-        super().show()  # Draw border
-        if self.has_border:  # Draw grid
-            color = self.bdcolor
-            x = self.col - 2  # Border top left corner
-            y = self.row - 2
-            dy = self.cheight
-            for row in range(1, self.nrows):
-                display.hline(x, y + row * dy, self.width + 4, color)
-            for cw in self.cwidth[:-1]:
-                x += cw
-                display.vline(x, y, self.height + 4, color)
+        full = self.damaged
+        if full:  # Redraw grid and all cells
+            if not super().show():  # Draw border
+                return
+            if self.has_border:  # Draw grid
+                color = self.bdcolor
+                x = self.col - 2  # Border top left corner
+                y = self.row - 2
+                dy = self.cheight
+                for row in range(1, self.nrows):
+                    display.hline(x, y + row * dy, self.width + 4, color)
+                for cw in self.cwidth[:-1]:
+                    x += cw
+                    display.vline(x, y, self.height + 4, color)
+        elif self.screen is Screen.current_screen:
+            self.draw = False
+            display.usegrey(False)
+        else:
+            return
+        flags = self._flags
+        ncols = self.ncols
+        wri = self.writer
+        ht = wri.height
+        for i in range(self.ncells):
+            f = flags[i]
+            if full or f & _DIRTY:
+                flags[i] = f & ~_DIRTY
+                c = i % ncols
+                y = self.row + (i // ncols) * self.cheight
+                display.fill_rect(self._cx[c], y, self.cwidth[c] - 4, ht, self._bg[i])
+                if (txt := self._text[i]) is not None:
+                    display.print_left(wri, self._tcol[i], y, txt, self._fg[i], self._bg[i], bool(f & _INVERT))
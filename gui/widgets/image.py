@@ -0,0 +1,164 @@
+# image.py Provides the Image widget: color images with an indexed palette.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Images are files created by optional_extras/py/mkimage.py. Format (little
+# endian): b"MGI1", width (2 bytes), height (2 bytes), no. of colors - 1 (1 byte),
+# palette (3 bytes RGB per color). Each row follows as a 2-byte length and
+# PackBits style RLE data: a control byte c < 128 is followed by c + 1 literal
+# color indices; c >= 128 is followed by a single index repeated c - 126 times.
+# Rows are read from the file one at a time, expanded into a GS8 row buffer and
+# blitted to the display using a palette FrameBuffer which maps indices to
+# display colors. Large images are drawn by an asyncio task which yields
+# periodically.
+
+import asyncio
+from framebuf import FrameBuffer, GS8, RGB565
+from micropython import const
+import micropython
+from utime import ticks_diff, ticks_ms
+from gui.core.ugui import Screen, Widget, ssd
+from gui.core.colors import lut_rgb
+
+_MAGIC = b"MGI1"
+_SYNC = const(4096)  # Images with more pixels than this are drawn asynchronously
+_SLICE = const(10)  # Max ms between yields when drawing asynchronously
+
+
+# Expand n bytes of RLE data into a row of wd bytes. Return the no. of pixels set.
+@micropython.viper
+def _unpack(src: ptr8, n: int, dst: ptr8, wd: int) -> int:
+    p = 0
+    x = 0
+    while p < n and x < wd:
+        c = src[p]
+        p += 1
+        if c < 128:  # Literal
+            c += 1
+            while c > 0 and x < wd:
+                dst[x] = src[p]
+                x += 1
+                p += 1
+                c -= 1
+        else:  # Run
+            c -= 126
+            v = src[p]
+            p += 1
+            while c > 0 and x < wd:
+                dst[x] = v
+                x += 1
+                c -= 1
+    return x
+
+
+class Image(Widget):
+    # Return width, height, RGB palette and offset of row data
+    @staticmethod
+    def _header(fn):
+        with open(fn, "rb") as f:
+            hdr = f.read(9)
+            if hdr[:4] != _MAGIC:
+                raise ValueError("Bad file format.")
+            wd = hdr[4] | hdr[5] << 8
+            ht = hdr[6] | hdr[7] << 8
+            nc = hdr[8] + 1
+            palette = f.read(nc * 3)
+        return wd, ht, palette, 9 + nc * 3
+
+    def __init__(self, writer, row, col, fn, *, bdcolor=False, colors=None):
+        wd, ht, _, _ = self._header(fn)
+        super().__init__(writer, row, col, ht, wd, None, None, bdcolor)
+        self._colors = colors  # Optional user mapping of indices to colors
+        self._code = bytearray(wd + (wd >> 7) + 1)  # Worst case RLE row
+        self._mvc = memoryview(self._code)
+        self._lbuf = bytearray(2)
+        self._rbuf = bytearray(wd)  # Row of color indices
+        self._fb = FrameBuffer(self._rbuf, wd, 1, GS8)
+        self._pal = None  # Palette FrameBuffer
+        self._offs = 0  # File offset of row data
+        self._task = None
+        self.value(fn)
+
+    # Display color of an RGB value. On drivers with a LUT use the nearest
+    # color which has been defined.
+    def _map(self, r, g, b):
+        if not hasattr(ssd, "lut"):
+            return ssd.rgb(r, g, b)
+        best = None
+        for idx, c in enumerate(lut_rgb):
+            if c is not None:
+                d = (c[0] - r) ** 2 + (c[1] - g) ** 2 + (c[2] - b) ** 2
+                if best is None or d < best:
+                    best = d
+                    res = idx
+        return res
+
+    def value(self, fn=None):
+        if fn is None:
+            return self._value
+        if not isinstance(fn, str):
+            raise ValueError("Value must be a filename.")
+        wd, ht, palette, self._offs = self._header(fn)
+        if not (wd == self.width and ht == self.height):
+            raise ValueError(f"Object dimensions {ht}x{wd} do not match widget {self.height}x{self.width}")
+        nc = len(palette) // 3
+        # Palette FrameBuffer: 16 bit pixels can hold any display color.
+        self._pal = FrameBuffer(bytearray(nc * 2), nc, 1, RGB565)
+        uc = self._colors
+        for idx in range(nc):
+            if uc is not None and idx < len(uc):
+                c = uc[idx]
+            else:
+                c = self._map(palette[3 * idx], palette[3 * idx + 1], palette[3 * idx + 2])
+            self._pal.pixel(idx, 0, c)
+        super().value(fn)
+
+    def show(self):
+        if self._task is not None:
+            self._task.cancel()  # A redraw is in progress
+            self._task = None
+        if not super().show(True):  # Draw or erase border
+            return
+        if self.width * self.height <= _SYNC:
+            for _ in self._rows():
+                pass
+        else:
+            self._task = asyncio.create_task(self._draw())
+            Screen.current_screen.reg_task(self._task, True)  # Cancel on screen change
+
+    def on_reopen(self):  # Drawing was cancelled by a screen change
+        if self._task is not None:
+            self._task = None
+            self.draw = True  # Redraw in full on the next refresh
+
+    async def _draw(self):
+        g = self._rows()
+        try:
+            t = ticks_ms()
+            for _ in g:
+                if ticks_diff(ticks_ms(), t) >= _SLICE:
+                    await asyncio.sleep_ms(0)
+                    t = ticks_ms()
+            self._task = None
+        finally:
+            g.close()  # Close file on cancellation
+
+    # Generator draws one row per iteration
+    def _rows(self):
+        wd = self.width
+        code = self._code
+        lbuf = self._lbuf
+        fb = self._fb
+        pal = self._pal
+        col = self.col
+        with open(self._value, "rb") as f:
+            f.seek(self._offs)
+            for row in range(self.row, self.row + self.height):
+                f.readinto(lbuf)
+                n = lbuf[0] | lbuf[1] << 8
+                if n > len(code) or f.readinto(self._mvc[:n]) != n:
+                    raise ValueError("Bad file format.")
+                _unpack(code, n, self._rbuf, wd)
+                ssd.blit(fb, col, row, -1, pal)
+                yield
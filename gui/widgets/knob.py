@@ -3,7 +3,13 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2021 Peter Hinch
 
-from gui.core.ugui import LinearIO, display
+# The face is drawn only when the widget is first displayed or its screen area
+# has been overwritten. The pointer is a sprite: the area under it is saved and
+# restored when it moves.
+
+from gui.core.ugui import LinearIO, Screen, display
+from gui.core.sprite import Sprite
+from gui.core.trig import angle, rsin, rcos
 import math
 
 TWOPI = 2 * math.pi
@@ -27,34 +33,54 @@ class Knob(LinearIO):
         self.pointerlen = radius - self.ticklen - 5
         self.ticks = max(ticks, 2) # start and end of travel
         self.color = color
+        # Integer geometry for drawing
+        self._arc = angle(self.arc)
+        self._xo = int(self.xorigin)
+        self._yo = int(self.yorigin)
+        self._rt = int(radius - self.ticklen)  # Radius of inner end of ticks
+        self._pl = int(self.pointerlen)
+        self._sprite = Sprite(int(self.pointerlen) + 4, int(self.pointerlen) + 4)
+        self._key = None  # Appearance of face when last drawn
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
 
     def show(self):
-        if super().show(False):  # Honour bgcolor
-            arc = self.arc
+        if self.screen is not Screen.current_screen:
+            return
+        key = (self.fgcolor, self.bgcolor, self.color, self._greyed_out)
+        if not self.damaged and key == self._key:  # Only the pointer has moved
+            self.draw = False
+            self.draw_border()  # Focus may have changed
+            display.usegrey(self._greyed_out)
+            self._sprite.restore()
+        elif super().show(False):  # Honour bgcolor
+            self._sprite.discard()
+            self._key = key
+            arc = self._arc
             ticks = self.ticks
-            radius = self.radius
-            ticklen = self.ticklen
+            radius = int(self.radius)
+            rt = self._rt
+            xo = self._xo
+            yo = self._yo
             for tick in range(ticks):
-                theta = (tick / (ticks - 1)) * arc - arc / 2
-                x_start = int(self.xorigin + radius * math.sin(theta))
-                y_start = int(self.yorigin - radius * math.cos(theta))
-                x_end = int(self.xorigin + (radius - ticklen) * math.sin(theta))
-                y_end = int(self.yorigin - (radius - ticklen) * math.cos(theta))
-                display.line(x_start, y_start, x_end, y_end, self.fgcolor)
+                a = tick * arc // (ticks - 1) - arc // 2
+                display.line(xo + rsin(radius, a), yo - rcos(radius, a), xo + rsin(rt, a), yo - rcos(rt, a), self.fgcolor)
             if self.color is not None:
-                display.fillcircle(self.xorigin, self.yorigin, radius - ticklen, self.color)
-            display.circle(self.xorigin, self.yorigin, radius - ticklen, self.fgcolor)
-            display.circle(self.xorigin, self.yorigin, radius - ticklen - 3, self.fgcolor)
-
-            self._drawpointer(self._value, self.fgcolor) # draw new
+                display.fillcircle(xo, yo, rt, self.color)
+            display.circle(xo, yo, rt, self.fgcolor)
+            display.circle(xo, yo, rt - 3, self.fgcolor)
+        else:
+            return
+        self._drawpointer(self._value, self.fgcolor) # draw new
 
     def _drawpointer(self, value, color):
-        arc = self.arc
-        length = self.pointerlen
-        angle = value * arc - arc / 2
-        x_end = int(self.xorigin + length * math.sin(angle))
-        y_end = int(self.yorigin - length * math.cos(angle))
-        display.line(int(self.xorigin), int(self.yorigin), x_end, y_end, color)
+        arc = self._arc
+        length = self._pl
+        a = int(value * arc) - arc // 2
+        x0 = self._xo
+        y0 = self._yo
+        x_end = x0 + rsin(length, a)
+        y_end = y0 - rcos(length, a)
+        self._sprite.save_points(((x0, y0), (x_end, y_end)))
+        display.line(x0, y0, x_end, y_end, color)
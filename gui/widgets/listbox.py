@@ -6,11 +6,66 @@
 # 13 Sep 24 Support dynamic elements list.
 # 12 Sep 21 Support for scrolling.
 
-from gui.core.ugui import Widget, display
+from gui.core.ugui import Widget, Screen, display
 from gui.core.colors import *
 
 dolittle = lambda *_: None
 
+
+# A Provider is a virtual elements list. Elements are retrieved in pages by a
+# user supplied fetch(start, n) function which returns an iterable (e.g. a list
+# or generator) of up to n elements beginning at index start. Only the most
+# recently used pages are retained. length is the number of elements or a
+# function returning it. width is the maximum width of an element's text in
+# pixels: if None, the width must be passed to the widget constructor.
+class Provider:
+    def __init__(self, length, fetch, *, width=None, page=16, pages=3):
+        self._length = length
+        self._fetch = fetch
+        self.width = width
+        self._psize = page
+        self._pages = pages
+        self._cache = []  # (page no, elements), most recent last
+
+    def __len__(self):
+        l = self._length
+        return l() if callable(l) else l
+
+    def __getitem__(self, idx):
+        l = len(self)
+        if idx < 0:
+            idx += l
+        if not 0 <= idx < l:
+            raise IndexError("Provider index out of range.")
+        pn, offs = divmod(idx, self._psize)
+        cache = self._cache
+        for n, page in enumerate(cache):
+            if page[0] == pn:
+                if n < len(cache) - 1:
+                    cache.append(cache.pop(n))
+                return page[1][offs]
+        start = pn * self._psize
+        els = list(self._fetch(start, min(self._psize, l - start)))
+        if len(cache) >= self._pages:
+            cache.pop(0)  # Discard least recently used
+        cache.append((pn, els))
+        return els[offs]
+
+    def __iter__(self):  # Sequential access bypasses the cache
+        l = len(self)
+        for start in range(0, l, self._psize):
+            for el in self._fetch(start, min(self._psize, l - start)):
+                yield el
+
+    def index(self, value):
+        for n, el in enumerate(self):
+            if el == value:
+                return n
+        raise ValueError("Value not in Provider.")
+
+    def invalidate(self):  # Source data has changed
+        self._cache = []
+
 # Behaviour has issues compared to touch displays because movement between
 # entries is sequential. This can affect the choice in when the callback runs.
 # It always runs when select is pressed. See 'also' ctor arg.
@@ -26,13 +81,20 @@ class Listbox(Widget):
     def dimensions(writer, elements, dlines):
         # Height of a single entry in list.
         entry_height = writer.height + 2  # Allow a pixel above and below text
+        virtual = isinstance(elements, Provider)
         # Number of displayable lines
-        dlines = len(elements) if dlines is None else dlines
+        if dlines is None:
+            dlines = len(elements)
+            if virtual:  # Limit to screen height
+                dlines = max(1, min(dlines, (display.height - 8) // entry_height))
         # Height of control
         height = entry_height * dlines + 2
-        simple = isinstance(elements[0], str)  # list or list of lists?
-        q = (p for p in elements) if simple else (p[0] for p in elements)
-        textwidth = max(writer.stringlen(x) for x in q) + 4
+        if virtual:  # Avoid retrieving every element. Width may be unknown.
+            textwidth = None if elements.width is None else elements.width + 4
+        else:
+            simple = isinstance(elements[0], str)  # list or list of lists?
+            q = (p for p in elements) if simple else (p[0] for p in elements)
+            textwidth = max(writer.stringlen(x) for x in q) + 4
         return entry_height, height, dlines, textwidth
 
     def __init__(
@@ -61,14 +123,17 @@ class Listbox(Widget):
         self.cb = callback if (self.simple or also == 4) else self.despatch
         if not (self.simple or also == 4) and callback is not dolittle:
             raise ValueError("Cannot specify callback.")
-        # Iterate text values
-        q = (p for p in self.els) if self.simple else (p[0] for p in self.els)
-        if not all(isinstance(x, str) for x in q):
-            raise ValueError("Invalid elements arg.")
+        if not isinstance(elements, Provider):
+            # Iterate text values
+            q = (p for p in self.els) if self.simple else (p[0] for p in self.els)
+            if not all(isinstance(x, str) for x in q):
+                raise ValueError("Invalid elements arg.")
 
         # Calculate dimensions
         self.entry_height, height, self.dlines, tw = self.dimensions(writer, self.els, dlines)
         if width is None:
+            if tw is None:
+                raise ValueError("Provider has no width: width must be specified.")
             width = tw  # Text width
 
         self.also = also  # Additioal callback events
@@ -86,27 +151,64 @@ class Listbox(Widget):
         self.fontcolor = fontcolor
         self._value = value  # No callback until user selects
         self.ev = value  # Value change detection
+        self._texts = {}  # Clipped text of visible lines
+        self._sel = None  # Currency, top line and greyed out status when last drawn
+        self._top = 0
+        self._grey = False
 
     def update(self):  # Elements list has changed.
+        if isinstance(self.els, Provider):
+            self.els.invalidate()
         l = len(self.els)
         nl = self.dlines  # No. of lines that can fit in window
         self.ntop = max(0, min(self.ntop, l - nl))
         self._value = min(self._value, l - 1)
+        self._texts = {}
+        self._sel = None  # Force a full redraw
         self.show()
 
     def show(self):
-        if not super().show(False):  # Clear to self.bgcolor
+        if self.screen is not Screen.current_screen:
             return
-
-        x = self.col
-        y = self.row
-        eh = self.entry_height
         dlines = self.dlines
         self.ntop = min(self.ntop, self._value)  # Ensure currency is visible
         self.ntop = max(self.ntop, self._value - dlines + 1)
         ntop = self.ntop
-        nlines = min(dlines, len(self.els))  # Displayable lines
-        for n in range(ntop, ntop + nlines):
+        # If the window has not scrolled only the old and new currency are drawn
+        if (
+            self._sel is not None
+            and not self.damaged
+            and ntop == self._top
+            and self._grey == self._greyed_out
+        ):
+            self.draw = False
+            self.draw_border()
+            display.usegrey(self._greyed_out)
+            for n in {self._sel, self._value}:
+                if ntop <= n < ntop + dlines:
+                    self._line(n)
+            self._hints(ntop)
+        else:
+            if not super().show(False):  # Clear to self.bgcolor
+                return
+            nlines = min(dlines, len(self.els))  # Displayable lines
+            texts = self._texts
+            for n in [n for n in texts if not ntop <= n < ntop + nlines]:
+                del texts[n]  # Retain clipped text of visible lines only
+            for n in range(ntop, ntop + nlines):
+                self._line(n, False)
+            self._hints(ntop)
+            self._top = ntop
+            self._grey = self._greyed_out
+        self._sel = self._value
+
+    # Draw line n. The background of an unselected line is filled unless it
+    # has just been cleared.
+    def _line(self, n, fill=True):
+        texts = self._texts
+        if n in texts:
+            text = texts[n]
+        else:
             text = self.els[n] if self.simple else self.els[n][0]
             if self.writer.stringlen(text) > self.width:  # Clip
                 font = self.writer.font
@@ -118,20 +220,26 @@ class Listbox(Widget):
                         break
                     nch += 1
                 text = text[:nch]
-            if n == self._value:
-                display.fill_rect(x, y + 1, self.width, eh - 1, self.select_color)
-                display.print_left(
-                    self.writer, x + 2, y + 1, text, self.fontcolor, self.select_color
-                )
-            else:
-                display.print_left(self.writer, x + 2, y + 1, text, self.fontcolor, self.bgcolor)
-            y += eh
-        # Draw a vertical line to hint at scrolling
+            texts[n] = text
+        x = self.col
+        eh = self.entry_height
+        y = self.row + (n - self.ntop) * eh
+        if n == self._value:
+            display.fill_rect(x, y + 1, self.width, eh - 1, self.select_color)
+            display.print_left(self.writer, x + 2, y + 1, text, self.fontcolor, self.select_color)
+        else:
+            if fill:
+                display.fill_rect(x, y + 1, self.width, eh - 1, self.bgcolor)
+            display.print_left(self.writer, x + 2, y + 1, text, self.fontcolor, self.bgcolor)
+
+    # Draw a vertical line to hint at scrolling
+    def _hints(self, ntop):
+        eh = self.entry_height
         x = self.col + self.width - 2
         if ntop:
             display.vline(x, self.row, eh - 1, self.fgcolor)
-        if ntop + dlines < len(self.els):
-            y = self.row + (dlines - 1) * eh
+        if ntop + self.dlines < len(self.els):
+            y = self.row + (self.dlines - 1) * eh
             display.vline(x, y, eh - 1, self.fgcolor)
 
     def textvalue(self, text=None):  # if no arg return current text
@@ -8,13 +8,15 @@
 
 from gui.core.ugui import Window, Screen, display
 from gui.widgets.buttons import Button
-from gui.widgets.listbox import Listbox
+from gui.widgets.listbox import Listbox, Provider
 from gui.core.colors import *
 
 # A SubMenu is a Window containing a Listbox
 # Next and Prev close the listbox without running the callback. This is
 # handled by Screen .move bound method
 class SubMenu(Window):
+    reuse = True  # May be cached if Screen.cache_size > 0
+
     def __init__(self, menu, button, elements):  # menu is parent Menu
         self.menu = menu
         self.button = button
@@ -23,9 +25,12 @@ class SubMenu(Window):
         col = button.col  # Drop down below top level menu button
         # Need to determine Window dimensions from size of Listbox, which
         # depends on number and length of elements.
-        te = [x[0] for x in elements]  # Text part
+        # A Provider is passed as is: the Listbox extracts the text part.
+        te = elements if isinstance(elements, Provider) else [x[0] for x in elements]
         self.elements = elements
         entry_height, lb_height, _, textwidth = Listbox.dimensions(wri, te, None)
+        if textwidth is None:
+            raise ValueError("Provider in a Menu must specify width.")
         lb_width = textwidth + 2
         # Calculate Window dimensions
         ap_height = lb_height + 6  # Allow for listbox border
@@ -3,7 +3,11 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2021 Peter Hinch
 
-from gui.core.ugui import Widget, display
+# After a full redraw the background under the pointer or bar is saved. A value
+# change redraws only the band between the old and new positions.
+
+from gui.core.ugui import Widget, Screen, display
+from gui.core.sprite import Sprite
 from gui.widgets.label import Label
 from gui.core.colors import *
 
@@ -35,6 +39,10 @@ class Meter(Widget):
                 mcol = max(mcol, l.mcol)
             self.mcol = mcol - 2  # For metrics. Legends never have border.
         self.regions = set()
+        # Background under a LINE pointer or the whole length of a BAR
+        self._sprite = Sprite(width, 1) if style == self.LINE else Sprite(4, height)
+        self._y = None  # Pointer position when last drawn
+        self._key = None  # Appearance of background when last drawn
         self.value(value)
 
     def value(self, n=None, color=None):
@@ -48,15 +56,33 @@ class Meter(Widget):
         return n
         
     def show(self):
-        if super().show():  # Draw or erase border
-            val = super().value()
-            wri = self.writer
-            width = self.width
-            height = self.height
-            x0 = self.col
-            x1 = self.col + width
-            y0 = self.row
-            y1 = self.row + height
+        if self.screen is not Screen.current_screen:
+            return
+        val = super().value()
+        width = self.width
+        height = self.height
+        x0 = self.col
+        x1 = self.col + width
+        y0 = self.row
+        y1 = self.row + height
+        y = int(y1 - val * height) # y position of slider
+        sprite = self._sprite
+        key = (self.fgcolor, self.bgcolor, self.ptcolor, self.divisions,
+               tuple((r.vlo, r.vhi, r.color) for r in self.regions))
+        if self._y is not None and not self.damaged and key == self._key:
+            self.draw = False
+            display.usegrey(False)
+            oy = self._y
+            if self.style == self.LINE:
+                if y != oy:
+                    sprite.restore()
+                    sprite.save(x0, y, width, 1)
+                    display.hline(x0, y, width, self.ptcolor)
+            elif y < oy:  # Bar has grown
+                display.fill_rect(int(x0 + width / 2 - 2), y, 4, oy - y, self.ptcolor)
+            else:  # Bar has shrunk: restore background between old and new tops
+                sprite.restore_rows(oy - y0, y - oy)
+        elif super().show():  # Draw or erase border
             for r in self.regions:
                 ht = round(height * (r.vhi - r.vlo))
                 yr = y1 - round(height * r.vhi)
@@ -66,13 +92,17 @@ class Meter(Widget):
                 for tick in range(self.divisions + 1):
                     ypos = int(y0 + dy * tick)
                     display.hline(x0 + 2, ypos, x1 - x0 - 4, self.fgcolor)
-
-            y = int(y1 - val * height) # y position of slider
+            self._key = key
             if self.style == self.LINE:
+                sprite.save(x0, y, width, 1)
                 display.hline(x0, y, width, self.ptcolor) # Draw pointer
             else:
                 w = width / 2
+                sprite.save(int(x0 + w - 2), y0, 4, height)
                 display.fill_rect(int(x0 + w - 2), y, 4, y1 - y, self.ptcolor)
+        else:
+            return
+        self._y = y
 
     def del_region(self, reg):
         self.regions.discard(reg)
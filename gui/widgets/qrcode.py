@@ -3,11 +3,11 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2022 Peter Hinch
 from framebuf import FrameBuffer, MONO_HLSB
+import asyncio
 from gui.core.ugui import Widget
 from gui.core.colors import *
 from gui.core.ugui import ssd
 from optional_extras.py.uQR import QRCode
-from utime import ticks_diff, ticks_ms
 
 
 class QRMap(Widget):
@@ -21,7 +21,7 @@ class QRMap(Widget):
         width = (side >> 3) + int(side & 7 > 0)  # Width in bytes
         return bytearray(side * width)
 
-    def __init__(self, writer, row, col, version=4, scale=1, *, bdcolor=RED, buf=None):
+    def __init__(self, writer, row, col, version=4, scale=1, *, bdcolor=RED, buf=None, cache=4):
         self._version = version
         self._scale = scale
         self._iside = self.len_side(version)  # Dimension of unscaled QR image less border
@@ -37,6 +37,9 @@ class QRMap(Widget):
         self._irow = row + border
         self._icol = col + border
         self._qr = QRCode(version, border=0)
+        self._cache = []  # LRU of (text, unscaled bitmap) most recent last
+        self._csize = cache
+        self._task = None
 
     def show(self):
         if super().show(False):  # Show white border
@@ -45,19 +48,70 @@ class QRMap(Widget):
             palette.fg(self.fgcolor)
             ssd.blit(self._fb, self._icol, self._irow, -1, palette)
 
+    def on_reopen(self):  # Generation was cancelled by a screen change: restart it
+        if self._task is not None:
+            self._task = None
+            self._update(None)
+
     def _update(self, _):  # Runs when value changes
-        t = ticks_ms()
+        text = self._value
+        if self._task is not None:
+            self._task.cancel()  # Superseded
+            self._task = None
+        cache = self._cache
+        for n, entry in enumerate(cache):
+            if entry[0] == text:
+                cache.append(cache.pop(n))  # Most recently used
+                self._render(entry[1])
+                return
         qr = self._qr
         qr.clear()
-        qr.add_data(self._value)
-        matrix = qr.get_matrix()  # 750ms. Rest of the routine adds 50ms
-        if qr.version != self._version:
+        qr.add_data(text)
+        if qr.best_fit(start=self._version) != self._version:
             raise ValueError("Text too long for QR version.")
+        self._task = asyncio.create_task(self._make(text))
+        self.screen.reg_task(self._task, True)  # Cancel on screen change
+
+    async def _make(self, text):
+        qr = self._qr
+        await qr.make_async(fit=False)  # Takes ~750ms, yielding between stages
+        matrix = qr.get_matrix()
         wd = self._iside
-        s = self._scale
+        sb = (wd + 7) >> 3  # Bytes per row
+        buf = bytearray(sb * wd)  # Unscaled MONO_HLSB bitmap
         for row in range(wd):
+            r = matrix[row]
+            offs = row * sb
             for col in range(wd):
-                v = matrix[row][col]
-                for nc in range(s):
-                    for nr in range(s):
-                        self._fb.pixel(col * s + nc, row * s + nr, v)
+                if r[col]:
+                    buf[offs + (col >> 3)] |= 0x80 >> (col & 7)
+        if self._csize:
+            if len(self._cache) >= self._csize:
+                self._cache.pop(0)  # Discard least recently used
+            self._cache.append((text, buf))
+        self._task = None
+        self._render(buf)
+
+    # Scale an unscaled bitmap into the FrameBuffer drawing runs of dark modules
+    def _render(self, buf):
+        wd = self._iside
+        s = self._scale
+        fb = self._fb
+        if s == 1:
+            fb.blit(FrameBuffer(buf, wd, wd, MONO_HLSB), 0, 0)
+        else:
+            sb = (wd + 7) >> 3
+            fb.fill(0)
+            for row in range(wd):
+                offs = row * sb
+                col = 0
+                while col < wd:
+                    if buf[offs + (col >> 3)] & (0x80 >> (col & 7)):
+                        start = col
+                        col += 1
+                        while col < wd and buf[offs + (col >> 3)] & (0x80 >> (col & 7)):
+                            col += 1
+                        fb.fill_rect(start * s, row * s, (col - start) * s, s, 1)
+                    else:
+                        col += 1
+        self.draw = True
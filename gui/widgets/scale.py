@@ -6,9 +6,8 @@
 # Usage:
 # from gui.widgets.scale import Scale
 
+from array import array
 from gui.core.ugui import LinearIO, display
-from hardware_setup import ssd  # Display driver for Writer
-from gui.core.writer import Writer
 from gui.core.colors import *
 
 dolittle = lambda *_ : None
@@ -55,6 +54,11 @@ class Scale(LinearIO):
         self.mdy0 = ycl - self.mdl // 2
         self.ldl = ctrl_ht  # Large tick
         self.ldy0 = ycl - self.ldl // 2
+        # Caches: rendered legends of visible ticks and colors of all ticks.
+        self._legends = {}  # Tick index: (FrameBuffer, width)
+        self._lcb = None  # legendcb used to render them
+        self._tcolors = array("i", (-1 for _ in range(ticks + 1)))
+        self._tkey = None  # (tickcb, fgcolor) used to compute tick colors
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
@@ -85,6 +89,17 @@ class Scale(LinearIO):
             win_width: int = x1 - x0
             ticks: int = self.ticks  # Total # of ticks visible and hidden
             txtcolor = GREY if self.greyed_out() else self.fontcolor
+            legends = self._legends if self._lcb is self.legendcb else {}
+            self._lcb = self.legendcb
+            visible = {}  # Legends drawn on this pass
+            tcolors = self._tcolors
+            tickcb = self.tickcb
+            if tickcb is not None:
+                tkey = self._tkey
+                if tkey is None or tkey[0] is not tickcb or tkey[1] != self.fgcolor:
+                    for n in range(len(tcolors)):
+                        tcolors[n] = -1
+                    self._tkey = (tickcb, self.fgcolor)
             while True:
                 x: int = x0 + (fx * win_width) // 200  # Current X position
                 ys: int  # Start Y position for tick
@@ -92,12 +107,14 @@ class Scale(LinearIO):
                 if x > x1 or iv > ticks:  # Out of space or data (scroll left)
                     break
                 if not iv % 10:
-                    txt = self.legendcb(self._fvalue(iv * 10))
-                    tlen = wri.stringlen(txt)
-                    Writer.set_textpos(ssd, y0, min(x, x1 - tlen))
-                    wri.setcolor(txtcolor, self.bgcolor)
-                    wri.printstring(txt)
-                    wri.setcolor()
+                    if iv in legends:
+                        legend = legends[iv]
+                    else:
+                        txt = self.legendcb(self._fvalue(iv * 10))
+                        legend = (wri.render(txt), wri.stringlen(txt))
+                    visible[iv] = legend
+                    if legend[0] is not None:
+                        wri.blit_text(legend[0], min(x, x1 - legend[1]), y0, txtcolor, self.bgcolor)
                     ys = self.ldy0  # Large tick
                     yl = self.ldl
                 elif not iv % 5:
@@ -106,13 +123,16 @@ class Scale(LinearIO):
                 else:
                     ys = self.sdy0
                     yl = self.sdl
-                if self.tickcb is None:
+                if tickcb is None:
                     color = self.fgcolor
                 else:
-                    color = self.tickcb(self._fvalue(iv * 10), self.fgcolor)
+                    if (color := tcolors[iv]) < 0:
+                        color = tickcb(self._fvalue(iv * 10), self.fgcolor)
+                        tcolors[iv] = color
                 display.vline(x, ys, yl, color)  # Draw tick
                 fx += 10
                 iv += 1
+            self._legends = visible
 
             display.vline(x0 + (x1 - x0) // 2, y0, y1 - y0, self.ptrcolor) # Draw pointer
 
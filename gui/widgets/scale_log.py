@@ -8,13 +8,11 @@
 # from gui.widgets.scale_log import ScaleLog
 
 
-import uasyncio as asyncio
-from time import ticks_ms, ticks_diff
 from math import log10
+from array import array
 
 from gui.core.ugui import LinearIO, display
-from hardware_setup import ssd  # Display driver for Writer
-from gui.core.writer import Writer
+from gui.primitives.autorepeat import autorepeat
 from gui.core.colors import *
 
 # Null function
@@ -68,6 +66,11 @@ class ScaleLog(LinearIO):
         self.ldl = ctrl_ht  # Large tick
         self.ldy0 = ycl - self.ldl // 2
         self.dw = (self.x1 - self.x0) // 2  # Pixel width of a decade
+        # Caches: rendered legends of visible decades and colors of all ticks.
+        self._legends = {}  # Decade: (FrameBuffer, width)
+        self._lcb = None  # legendcb used to render them
+        self._tcolors = array("i", (-1 for _ in range((decades + 1) * 9)))
+        self._tkey = None  # (tickcb, fgcolor) used to compute tick colors
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
@@ -86,7 +89,19 @@ class ScaleLog(LinearIO):
             vc = self._value  # Current value, corresponds to centre of display
             d = int(log10(vc)) - 1  # 10**d is start of a decade guaranteed to be outside display
             vs = max(10 ** d, 1.0)  # vs: start value of current decade
+            k = max(d, 0)  # Index of current decade
             txtcolor = GREY if self.greyed_out() else self.fontcolor
+            legends = self._legends if self._lcb is self.legendcb else {}
+            self._lcb = self.legendcb
+            visible = {}  # Legends drawn on this pass
+            tcolors = self._tcolors
+            tickcb = self.tickcb
+            if tickcb is not None:
+                tkey = self._tkey
+                if tkey is None or tkey[0] is not tickcb or tkey[1] != self.fgcolor:
+                    for n in range(len(tcolors)):
+                        tcolors[n] = -1
+                    self._tkey = (tickcb, self.fgcolor)
             while True:  # For each decade until we run out of space
                 done = True  # Assume completion
                 xs: float = xc - dw * log10(vc / vs)  # x location of start of scale
@@ -100,11 +115,14 @@ class ScaleLog(LinearIO):
                         break  # All visible ticks drawn
                     elif x > x0:  # Tick is visible
                         if not tick:
-                            txt = self.legendcb(vt)
-                            tlen = wri.stringlen(txt)
-                            Writer.set_textpos(ssd, y0, min(x, x1 - tlen))
-                            wri.setcolor(txtcolor, self.bgcolor)
-                            wri.printstring(txt)
+                            if k in legends:
+                                legend = legends[k]
+                            else:
+                                txt = self.legendcb(vt)
+                                legend = (wri.render(txt), wri.stringlen(txt))
+                            visible[k] = legend
+                            if legend[0] is not None:
+                                wri.blit_text(legend[0], min(x, x1 - legend[1]), y0, txtcolor, self.bgcolor)
                             ys = self.ldy0  # Large tick
                             yl = self.ldl
                         elif tick == 4:
@@ -113,18 +131,22 @@ class ScaleLog(LinearIO):
                         else:
                             ys = self.sdy0
                             yl = self.sdl
-                        if self.tickcb is None:
+                        if tickcb is None:
                             color = self.fgcolor
                         else:
-                            color = self.tickcb(vt, self.fgcolor)
+                            if (color := tcolors[k * 9 + tick]) < 0:
+                                color = tickcb(vt, self.fgcolor)
+                                tcolors[k * 9 + tick] = color
                         display.vline(x, ys, yl, color)  # Draw tick
                         if (not tick) and (vt > 0.999 * self.mval):
                             break  # Drawn last tick at end of data
                 else:
                     vs *= 10  # More to do. Next decade.
+                    k += 1
                     done = False
                 if done:
                     break
+            self._legends = visible
 
             display.vline(xc, y0, y1 - y0, self.ptrcolor) # Draw pointer
             #print(ticks_diff(ticks_ms(), start)) 75-95ms on Pyboard D depending on calbacks
@@ -148,9 +170,9 @@ class ScaleLog(LinearIO):
             delta = self.delta * self.encoder_rate * 0.1 if self.precision() else self.delta * self.encoder_rate
             self.value(self.value() * (1 + delta)**val)
         else:  # val == 1 or -1
-            asyncio.create_task(self.btnhan(button, val))
+            self.btnhan(button, val)
 
-    async def btnhan(self, button, up):
+    def btnhan(self, button, up):
         up = up == 1
         if self.precision():
             delta = self.delta * 0.1
@@ -158,13 +180,9 @@ class ScaleLog(LinearIO):
         else:
             delta = self.delta
             maxdelta = 0.64
-        smul= (1 + delta) if up else (1 / (1 + delta))
+        self._mul(up, delta)
+        autorepeat.start(button, lambda d: self._mul(up, d), delta, maxdelta, self.curve)
+
+    def _mul(self, up, delta):  # Multiply value by 1 + delta or its reciprocal
+        smul = (1 + delta) if up else (1 / (1 + delta))
         self.value(self.value() * smul)
-        t = ticks_ms()
-        while button():
-            await asyncio.sleep_ms(0)  # Quit fast on button release
-            if ticks_diff(ticks_ms(), t) > 500:  # Button was held down
-                delta = min(maxdelta, delta * 2)
-                smul = (1 + delta) if up else (1 / (1 + delta))
-                self.value(self.value() * smul)
-                t = ticks_ms()
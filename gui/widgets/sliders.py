@@ -3,8 +3,12 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2021 Peter Hinch
 
+# After a full redraw the background under the slide is saved. A value change
+# restores it and draws the slide at its new position.
+
 from micropython import const
-from gui.core.ugui import LinearIO, display
+from gui.core.ugui import LinearIO, Screen, display
+from gui.core.sprite import Sprite
 from gui.core.colors import *
 
 # Null function
@@ -17,7 +21,37 @@ _SLIDE_DEPTH = const(6)  # Must be divisible by 2
 _TICK_VISIBLE = const(3)  # No. of tick pixels visible either side of slider
 _HALF_SLOT_WIDTH = const(2)  # Width of slot /2
 
-class Slider(LinearIO):
+
+# Common code for moving the slide without a full redraw.
+class _Slide(LinearIO):
+    def _appearance(self):
+        return (self.fgcolor, self.bgcolor, self.slotcolor, self.fontcolor, self._greyed_out)
+
+    # Slide occupies x, y, w, h. If only its position pos has changed, move it
+    # and return True.
+    def _delta(self, pos, x, y, w, h):
+        if self._pos is None or self.damaged or self._key != self._appearance():
+            return False
+        self.draw = False
+        self.draw_border()  # Focus may have changed
+        display.usegrey(self._greyed_out)
+        if pos != self._pos:
+            self._pos = pos
+            sprite = self._sprite
+            sprite.restore()
+            sprite.save(x, y, w, h)
+            display.fill_rect(x, y, w, h, self.fgcolor)
+        return True
+
+    # Save the background and draw the slide after a full redraw.
+    def _draw_slide(self, pos, x, y, w, h):
+        self._key = self._appearance()
+        self._pos = pos
+        self._sprite.save(x, y, w, h)
+        display.fill_rect(x, y, w, h, self.fgcolor)
+
+
+class Slider(_Slide):
     def __init__(self, writer, row, col, *,
                  height=100, width=20, divisions=10, legends=None,
                  fgcolor=None, bgcolor=None, fontcolor=None, bdcolor=None,
@@ -44,11 +78,19 @@ class Slider(LinearIO):
         self.slot_x0 = centre - _HALF_SLOT_WIDTH
         self.slot_y0 = row + _SLIDE_DEPTH // 2
         self.slot_h = height - _SLIDE_DEPTH - 1
+        self._sprite = Sprite(self.slide_w, _SLIDE_DEPTH)  # Background under slide
+        self._pos = None  # Slide position when last drawn
+        self._key = None  # Appearance of background when last drawn
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
 
     def show(self):
+        if self.screen is not Screen.current_screen:
+            return
+        slide_y = round(self.slide_y0 - self._value * self.slot_h)
+        if self._delta(slide_y, self.slide_x0, slide_y, self.slide_w, _SLIDE_DEPTH):
+            return
         # Blank slot, ticks and slider
         if super().show(False):  # Honour bgcolor
             x = self.col
@@ -82,8 +124,7 @@ class Slider(LinearIO):
                                        legend, txtcolor, self.bgcolor)
                     yl -= dy
 
-            slide_y = round(self.slide_y0 - self._value * slot_len)
-            display.fill_rect(self.slide_x0, slide_y, self.slide_w, _SLIDE_DEPTH, self.fgcolor)
+            self._draw_slide(slide_y, self.slide_x0, slide_y, self.slide_w, _SLIDE_DEPTH)
             self.drawn = True
 
     def color(self, color):
@@ -92,7 +133,7 @@ class Slider(LinearIO):
             self.draw = True
 
 
-class HorizSlider(LinearIO):
+class HorizSlider(_Slide):
     def __init__(self, writer, row, col, *,
                  height=20, width=100, divisions=10, legends=None,
                  fgcolor=None, bgcolor=None, fontcolor=None, bdcolor=None,
@@ -116,11 +157,20 @@ class HorizSlider(LinearIO):
         self.slot_w = width - _SLIDE_DEPTH - 1
         centre = row + height // 2
         self.slot_y0 = centre - _HALF_SLOT_WIDTH
+        self._sprite = Sprite(_SLIDE_DEPTH, self.slide_h)  # Background under slide
+        self._pos = None  # Slide position when last drawn
+        self._key = None  # Appearance of background when last drawn
         self.draw = True  # Ensure a redraw on next refresh
         # Run callback (e.g. to set dynamic colors)
         self.callback(self, *self.args)
 
     def show(self):
+        if self.screen is not Screen.current_screen:
+            return
+        slide_x = round(self.col + self._value * self.slot_w)
+        self.slide_x = slide_x
+        if self._delta(slide_x, slide_x, self.slide_y0, _SLIDE_DEPTH, self.slide_h):
+            return
         # Blank slot, ticks and slider
         if super().show(False):  # Honour bgcolor
             x = self.slot_x0
@@ -152,8 +202,7 @@ class HorizSlider(LinearIO):
                                        legend, txtcolor, self.bgcolor)
                     xl += dx
 
-            self.slide_x = round(self.col + self._value * slot_len)
-            display.fill_rect(self.slide_x, self.slide_y0, _SLIDE_DEPTH, self.slide_h, self.fgcolor)
+            self._draw_slide(slide_x, slide_x, self.slide_y0, _SLIDE_DEPTH, self.slide_h)
             self.drawn = True
 
     def color(self, color):
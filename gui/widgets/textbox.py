@@ -9,9 +9,7 @@
 from gui.core.ugui import LinearIO
 from hardware_setup import ssd  # Display driver for Writer
 from gui.core.writer import Writer
-
-from time import ticks_diff, ticks_ms
-import uasyncio as asyncio
+from gui.primitives.autorepeat import autorepeat
 
 # Reason for no tab support in nano-gui/private/reason_for_no_tabs
 
@@ -133,15 +131,8 @@ class Textbox(LinearIO):
         if isinstance(button, int):  # Using an encoder
             self.scroll(val)
         else:
-            asyncio.create_task(self.btn_handler(button, val))
+            self.btn_handler(button, val)
 
-    async def btn_handler(self, button, up):  # Only runs if not using encoder
+    def btn_handler(self, button, up):  # Only runs if not using encoder
         self.scroll(-up)
-        t = ticks_ms()
-        d = 1
-        while not button():
-            await asyncio.sleep_ms(0)  # Quit fast on button release
-            if ticks_diff(ticks_ms(), t) > 500:  # Button was held down
-                d = min(16, d * 2)
-                self.scroll(-up * d)
-                t = ticks_ms()
+        autorepeat.start(button, lambda d: self.scroll(-up * d), 1, 16, self.curve)
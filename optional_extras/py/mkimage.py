@@ -0,0 +1,91 @@
+#! /usr/bin/env python3
+# mkimage.py Convert an image to the format used by the micro-gui Image widget.
+# Runs on a PC under CPython.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Usage: mkimage.py infile outfile [-c colors]
+# Binary PPM (P6) files with up to 256 distinct colors are read without further
+# dependencies. If Pillow is installed any image format may be read: images are
+# quantised to the number of colors specified by -c (default 256).
+
+import argparse
+import struct
+import sys
+
+
+def read_ppm(fn):
+    with open(fn, "rb") as f:
+        data = f.read()
+    fields = []
+    pos = 0
+    while len(fields) < 4:  # Magic, width, height, maxval
+        while data[pos : pos + 1].isspace():
+            pos += 1
+        if data[pos : pos + 1] == b"#":  # Comment
+            pos = data.index(b"\n", pos)
+            continue
+        start = pos
+        while not data[pos : pos + 1].isspace():
+            pos += 1
+        fields.append(data[start:pos])
+    if fields[0] != b"P6" or int(fields[3]) != 255:
+        raise ValueError("Only binary PPM files with maxval 255 are supported.")
+    wd, ht = int(fields[1]), int(fields[2])
+    pix = data[pos + 1 : pos + 1 + wd * ht * 3]
+    return wd, ht, [tuple(pix[n : n + 3]) for n in range(0, len(pix), 3)]
+
+
+def read_image(fn, ncolors):
+    try:
+        from PIL import Image
+    except ImportError:
+        return read_ppm(fn)
+    img = Image.open(fn).convert("RGB").quantize(ncolors).convert("RGB")
+    return img.width, img.height, list(img.getdata())
+
+
+def packbits(row):  # Encode a row of color indices
+    out = bytearray()
+    n = 0
+    while n < len(row):
+        run = 1
+        while n + run < len(row) and run < 129 and row[n + run] == row[n]:
+            run += 1
+        if run > 1:
+            out += bytes((run + 126, row[n]))
+            n += run
+            continue
+        start = n  # Literal: extend until a run of 2 or more starts
+        n += 1
+        while n < len(row) and n - start < 128 and not (n + 1 < len(row) and row[n] == row[n + 1]):
+            n += 1
+        out.append(n - start - 1)
+        out += bytes(row[start:n])
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create an image file for the micro-gui Image widget.")
+    parser.add_argument("infile")
+    parser.add_argument("outfile")
+    parser.add_argument("-c", "--colors", type=int, default=256, help="Max no. of colors (2-256).")
+    args = parser.parse_args()
+    wd, ht, pixels = read_image(args.infile, args.colors)
+    palette = sorted(set(pixels))
+    if len(palette) > 256:
+        sys.exit(f"Image has {len(palette)} colors: the maximum is 256.")
+    index = {c: n for n, c in enumerate(palette)}
+    with open(args.outfile, "wb") as f:
+        f.write(b"MGI1" + struct.pack("<HHB", wd, ht, len(palette) - 1))
+        for c in palette:
+            f.write(bytes(c))
+        for y in range(ht):
+            row = packbits([index[c] for c in pixels[y * wd : (y + 1) * wd]])
+            f.write(struct.pack("<H", len(row)) + row)
+    print(f"Written {args.outfile}: {wd}x{ht} pixels, {len(palette)} colors.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# qrbench.py Benchmark uQR code generation for versions 1-10.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Run under the unix port (or on a target) from this directory:
+# $ micropython qrbench.py
+# Each version is filled to about 90% of its byte mode capacity at the default
+# error correction level. Times are in ms, averaged over several runs:
+# data is encoding and Reed-Solomon, masks is evaluation of all eight mask
+# patterns, total is a complete get_matrix() call.
+
+import time
+from uQR import QRCode, BIT_LIMIT_TABLE, ERROR_CORRECT_M, create_data
+
+RUNS = 5
+
+
+def ms(t):
+    return time.ticks_diff(time.ticks_us(), t) / 1000
+
+
+def bench(version):
+    nbytes = (BIT_LIMIT_TABLE[ERROR_CORRECT_M][version] // 8 - 3) * 9 // 10
+    text = "".join(chr(0x61 + n % 26) for n in range(nbytes))
+    tdata = tmask = ttotal = 0
+    for _ in range(RUNS):
+        qr = QRCode(version, border=0)
+        qr.add_data(text, optimize=0)
+        qr.best_fit(start=version)
+        t = time.ticks_us()
+        qr.data_cache = create_data(version, qr.error_correction, qr.data_list)
+        tdata += ms(t)
+        t = time.ticks_us()
+        qr.best_mask_pattern()
+        tmask += ms(t)
+        qr.clear()
+        qr.add_data(text, optimize=0)
+        t = time.ticks_us()
+        qr.get_matrix()
+        ttotal += ms(t)
+    return nbytes, tdata / RUNS, tmask / RUNS, ttotal / RUNS
+
+
+print("version  bytes   data  masks  total")
+for version in range(1, 11):
+    print("{:7d} {:6d} {:6.1f} {:6.1f} {:6.1f}".format(version, *bench(version)))
@@ -1,4 +1,6 @@
 import ure as re
+import asyncio
+import micropython
 
 """
 Exceptions
@@ -89,6 +91,11 @@ for i in range(8, 256):
 for i in range(255):
     LOG_TABLE[EXP_TABLE[i]] = i
 
+# Byte tables for the RS encoder. _EXP is doubled so that the sum of two logs
+# can index it without a modulo operation.
+_EXP = bytearray(EXP_TABLE[:255] * 2)
+_LOG = bytearray(LOG_TABLE)
+
 RS_BLOCK_OFFSET = {
     ERROR_CORRECT_L: 0,
     ERROR_CORRECT_M: 1,
@@ -269,66 +276,41 @@ def gexp(n):
     return EXP_TABLE[n % 255]
 
 
-class Polynomial:
-
-    def __init__(self, num, shift):
-        if not num:  # pragma: no cover
-            raise Exception("%s/%s" % (len(num), shift))
+# Logs of the coefficients of the RS generator polynomial for ecCount error
+# correction codewords, excluding the leading 1. The polynomials in rsPoly_LUT
+# have no zero coefficients.
+_rs_generators = {}
 
-        for offset in range(len(num)):
-            if num[offset] != 0:
-                break
+def rs_generator(ecCount):
+    if ecCount not in _rs_generators:
+        if ecCount in rsPoly_LUT:
+            num = rsPoly_LUT[ecCount]
         else:
-            offset += 1
-        if isinstance(num[offset:], bytes):
-            shift_chunk = b'\x00'*shift
-        elif isinstance(num[offset:], list):
-            shift_chunk = [0]*shift
-        self.num = bytearray(num[offset:]+shift_chunk)
-
-    def __getitem__(self, index):
-        return self.num[index]
-
-    def __iter__(self):
-        return iter(self.num)
-
-    def __len__(self):
-        return len(self.num)
-
-    def __mul__(self, other):
-        num = [0] * (len(self) + len(other) - 1)
-
-        for i, item in enumerate(self):
-            for j, other_item in enumerate(other):
-                num[i + j] ^= gexp(glog(item) + glog(other_item))
-
-        return Polynomial(num, 0)
-
-    """
-    EDIT
-    """
-
-    def __mod__(self, other):
-
-        this = self
-
-        while True:
-            difference = len(this) - len(other)
-
-            if difference < 0:
-                break
-
-            ratio = glog(this[0]) - glog(other[0])
-
-            num = [
-                item ^ gexp(glog(other_item) + ratio)
-                for item, other_item in zip(this, other)]
-            if difference:
-                num.extend(this[-difference:])
-
-            this = Polynomial(num, 0)
-
-        return this
+            num = [1]
+            for i in range(ecCount):  # Multiply by (x + a^i)
+                num = [a ^ (gexp(glog(b) + i) if b else 0)
+                       for a, b in zip(num + [0], [0] + num)]
+        _rs_generators[ecCount] = bytearray(glog(x) for x in num[1:])
+    return _rs_generators[ecCount]
+
+
+# Remainder of division of nd data bytes by the generator polynomial with ne
+# coefficient logs in glg, written to rem. An LFSR: no allocation.
+@micropython.viper
+def _rs_remainder(data: ptr8, nd: int, glg: ptr8, ne: int, rem: ptr8):
+    ex = ptr8(_EXP)
+    lg = ptr8(_LOG)
+    for i in range(ne):
+        rem[i] = 0
+    for k in range(nd):
+        f = data[k] ^ rem[0]
+        for i in range(ne - 1):
+            rem[i] = rem[i + 1]
+        rem[ne - 1] = 0
+        if f:
+            lf = lg[f]
+            for i in range(ne):
+                rem[i] = rem[i] ^ ex[glg[i] + lf]
 
 
 class RSBlock:
@@ -484,27 +466,82 @@ def pattern_position(version):
     return PATTERN_POSITION_TABLE[version - 1]
 
 
-def make_mask_func(pattern):
-    """
-    Return the mask function for the given mask pattern.
-    """
-    if pattern == 0:   # 000
-        return lambda i, j: (i + j) % 2 == 0
-    if pattern == 1:   # 001
-        return lambda i, j: i % 2 == 0
-    if pattern == 2:   # 010
-        return lambda i, j: j % 3 == 0
-    if pattern == 3:   # 011
-        return lambda i, j: (i + j) % 3 == 0
-    if pattern == 4:   # 100
-        return lambda i, j: (int(i / 2) + int(j / 3)) % 2 == 0
-    if pattern == 5:  # 101
-        return lambda i, j: (i * j) % 2 + (i * j) % 3 == 0
-    if pattern == 6:  # 110
-        return lambda i, j: ((i * j) % 2 + (i * j) % 3) % 2 == 0
-    if pattern == 7:  # 111
-        return lambda i, j: ((i * j) % 3 + (i + j) % 2) % 2 == 0
-    raise TypeError("Bad mask pattern: " + pattern)  # pragma: no cover
+# Matrices are flat bytearrays of modules_count ** 2 modules, one byte each with
+# a value of 0 (light) or 1 (dark). A second bytearray flags function modules.
+
+# Invert the data modules of a matrix according to a mask pattern. Row and
+# column residues are maintained incrementally to avoid division.
+@micropython.viper
+def _apply_mask(m: ptr8, fn: ptr8, n: int, mask: int):
+    i3 = 0  # i % 3
+    for i in range(n):
+        p = i * n
+        j3 = 0  # j % 3
+        jd = 0  # (j // 3) & 1
+        for j in range(n):
+            if fn[p + j] == 0:
+                if mask == 0:
+                    t = (i + j) & 1
+                elif mask == 1:
+                    t = i & 1
+                elif mask == 2:
+                    t = j3
+                elif mask == 3:
+                    t = i3 + j3
+                    if t == 3:
+                        t = 0
+                elif mask == 4:
+                    t = ((i >> 1) + jd) & 1
+                else:
+                    t = i3 * j3  # (i * j) % 3 is 0 if this is 0
+                    if t >= 3:
+                        t -= 3
+                    if mask == 5:
+                        t |= i & j & 1
+                    elif mask == 6:
+                        t = (t + (i & j & 1)) & 1
+                    else:
+                        t = (t + i + j) & 1
+                if t == 0:
+                    m[p + j] = m[p + j] ^ 1
+            j3 += 1
+            if j3 == 3:
+                j3 = 0
+                jd ^= 1
+        i3 += 1
+        if i3 == 3:
+            i3 = 0
+
+
+# Place nd bytes of data in the non-function modules of a matrix, in the
+# zigzag order of the standard.
+@micropython.viper
+def _map_data(m: ptr8, fn: ptr8, n: int, data: ptr8, nd: int):
+    inc = -1
+    row = n - 1
+    bit = 7
+    idx = 0
+    c0 = n - 1
+    while c0 > 0:
+        col = c0 - 1 if c0 <= 6 else c0  # Skip the vertical timing pattern
+        while True:
+            for c in range(col, col - 2, -1):
+                p = row * n + c
+                if fn[p] == 0:
+                    dark = 0
+                    if idx < nd:
+                        dark = (data[idx] >> bit) & 1
+                    m[p] = dark
+                    bit -= 1
+                    if bit == -1:
+                        idx += 1
+                        bit = 7
+            row += inc
+            if row < 0 or n <= row:
+                row -= inc
+                inc = -inc
+                break
+        c0 -= 2
 
 
 def mode_sizes_for_version(version):
@@ -528,178 +565,58 @@ def length_in_bits(mode, version):
     return mode_sizes_for_version(version)[mode]
 
 
-def make_lost_point(modules):
-    modules_count = len(modules)
-
-    lost_point = 0
-
-    lost_point = _lost_point_level1(modules, modules_count)
-    lost_point += _lost_point_level2(modules, modules_count)
-    lost_point += _lost_point_level3(modules, modules_count)
-    lost_point += _lost_point_level4(modules, modules_count)
-
-    return lost_point
-
-
-def _lost_point_level1(modules, modules_count):
-    lost_point = 0
-
-    modules_range = range(modules_count)
-    container = [0] * (modules_count + 1)
-
-    for row in modules_range:
-        this_row = modules[row]
-        previous_color = this_row[0]
-        length = 0
-        for col in modules_range:
-            if this_row[col] == previous_color:
-                length += 1
-            else:
-                if length >= 5:
-                    container[length] += 1
-                length = 1
-                previous_color = this_row[col]
-        if length >= 5:
-            container[length] += 1
-
-    for col in modules_range:
-        previous_color = modules[0][col]
-        length = 0
-        for row in modules_range:
-            if modules[row][col] == previous_color:
-                length += 1
-            else:
-                if length >= 5:
-                    container[length] += 1
-                length = 1
-                previous_color = modules[row][col]
-        if length >= 5:
-            container[length] += 1
-
-    lost_point += sum(container[each_length] * (each_length - 2)
-        for each_length in range(5, modules_count + 1))
-
-    return lost_point
-
-
-def _lost_point_level2(modules, modules_count):
-    lost_point = 0
-
-    modules_range = range(modules_count - 1)
-    for row in modules_range:
-        this_row = modules[row]
-        next_row = modules[row + 1]
-        # use iter() and next() to skip next four-block. e.g.
-        # d a f   if top-right a != b botton-right,
-        # c b e   then both abcd and abef won't lost any point.
-        modules_range_iter = iter(modules_range)
-        for col in modules_range_iter:
-            top_right = this_row[col + 1]
-            if top_right != next_row[col + 1]:
-                # reduce 33.3% of runtime via next().
-                # None: raise nothing if there is no next item.
-                try:
-                    next(modules_range_iter)
-                except StopIteration:
-                    pass
-            elif top_right != this_row[col]:
-                continue
-            elif top_right != next_row[col]:
-                continue
-            else:
-                lost_point += 3
-
-    return lost_point
-
-
-def _lost_point_level3(modules, modules_count):
-    # 1 : 1 : 3 : 1 : 1 ratio (dark:light:dark:light:dark) pattern in
-    # row/column, preceded or followed by light area 4 modules wide. From ISOIEC.
-    # pattern1:     10111010000
-    # pattern2: 00001011101
-    modules_range = range(modules_count)
-    modules_range_short = range(modules_count-10)
-    lost_point = 0
-
-    for row in modules_range:
-        this_row = modules[row]
-        modules_range_short_iter = iter(modules_range_short)
-        col = 0
-        for col in modules_range_short_iter:
-            if (
-                        not this_row[col + 1]
-                    and this_row[col + 4]
-                    and not this_row[col + 5]
-                    and this_row[col + 6]
-                    and not this_row[col + 9]
-                and (
-                        this_row[col + 0]
-                    and this_row[col + 2]
-                    and this_row[col + 3]
-                    and not this_row[col + 7]
-                    and not this_row[col + 8]
-                    and not this_row[col + 10]
-                or
-                        not this_row[col + 0]
-                    and not this_row[col + 2]
-                    and not this_row[col + 3]
-                    and this_row[col + 7]
-                    and this_row[col + 8]
-                    and this_row[col + 10]
-                    )
-                ):
-                lost_point += 40
-# horspool algorithm.
-# if this_row[col + 10] == True,  pattern1 shift 4, pattern2 shift 2. So min=2.
-# if this_row[col + 10] == False, pattern1 shift 1, pattern2 shift 1. So min=1.
-            if this_row[col + 10]:
-                try:
-                    next(modules_range_short_iter)
-                except StopIteration:
-                    pass
-
-    for col in modules_range:
-        modules_range_short_iter = iter(modules_range_short)
-        row = 0
-        for row in modules_range_short_iter:
-            if (
-                        not modules[row + 1][col]
-                    and modules[row + 4][col]
-                    and not modules[row + 5][col]
-                    and modules[row + 6][col]
-                    and not modules[row + 9][col]
-                and (
-                        modules[row + 0][col]
-                    and modules[row + 2][col]
-                    and modules[row + 3][col]
-                    and not modules[row + 7][col]
-                    and not modules[row + 8][col]
-                    and not modules[row + 10][col]
-                or
-                        not modules[row + 0][col]
-                    and not modules[row + 2][col]
-                    and not modules[row + 3][col]
-                    and modules[row + 7][col]
-                    and modules[row + 8][col]
-                    and modules[row + 10][col]
-                    )
-                ):
-                lost_point += 40
-            if modules[row + 10][col]:
-                try:
-                    next(modules_range_short_iter)
-                except StopIteration:
-                    pass
-
-    return lost_point
-
-
-def _lost_point_level4(modules, modules_count):
-    dark_count = sum(map(sum, modules))
-    percent = float(dark_count) / (modules_count**2)
-    # Every 5% departure from 50%, rating++
+def make_lost_point(modules, modules_count):
+    lost_point = _lost_point(modules, modules_count)
+    # Every 5% departure from 50% dark modules, rating++
+    percent = float(_dark_count(modules, modules_count ** 2)) / (modules_count**2)
     rating = int(abs(percent * 100 - 50) / 5)
-    return rating * 10
+    return lost_point + rating * 10
+
+
+# Penalty rules 1 to 3 of the standard, each applied to rows and columns:
+# runs of five or more modules of one color, 2x2 blocks of one color, and the
+# 1:1:3:1:1 finder-like pattern preceded or followed by four light modules.
+# The latter is detected by matching an 11 module shift register.
+@micropython.viper
+def _lost_point(m: ptr8, n: int) -> int:
+    lost = 0
+    for a in range(n):
+        for d in range(2):  # Row a, then column a
+            p = a * n if d == 0 else a
+            step = 1 if d == 0 else n
+            prev = m[p]
+            length = 0
+            window = 0
+            for b in range(n):
+                v = m[p]
+                p += step
+                if v == prev:
+                    length += 1
+                else:
+                    if length >= 5:
+                        lost += length - 2
+                    length = 1
+                    prev = v
+                window = ((window << 1) | v) & 0x7FF
+                if b >= 10 and (window == 0x5D0 or window == 0x05D):
+                    lost += 40
+            if length >= 5:
+                lost += length - 2
+    for r in range(n - 1):
+        p = r * n
+        for c in range(n - 1):
+            v = m[p + c]
+            if v == m[p + c + 1] and v == m[p + n + c] and v == m[p + n + c + 1]:
+                lost += 3
+    return lost
+
+
+@micropython.viper
+def _dark_count(m: ptr8, nn: int) -> int:
+    dark = 0
+    for i in range(nn):
+        dark += m[i]
+    return dark
 
 
 def optimal_data_chunks(data, minimum=4):
@@ -823,7 +740,7 @@ class QRData:
 class BitBuffer:
 
     def __init__(self):
-        self.buffer = []
+        self.buffer = bytearray()
         self.length = 0
 
     def __repr__(self):
@@ -855,8 +772,9 @@ def create_bytes(buffer, rs_blocks):
     maxDcCount = 0
     maxEcCount = 0
 
-    dcdata = [0] * len(rs_blocks)
-    ecdata = [0] * len(rs_blocks)
+    dcdata = [None] * len(rs_blocks)
+    ecdata = [None] * len(rs_blocks)
+    buf = memoryview(buffer.buffer)
 
     for r in range(len(rs_blocks)):
 
@@ -866,36 +784,17 @@ def create_bytes(buffer, rs_blocks):
         maxDcCount = max(maxDcCount, dcCount)
         maxEcCount = max(maxEcCount, ecCount)
 
-        dcdata[r] = [0] * dcCount
-
-        for i in range(len(dcdata[r])):
-            dcdata[r][i] = 0xff & buffer.buffer[i + offset]
+        dcdata[r] = buf[offset : offset + dcCount]
         offset += dcCount
 
-        # Get error correction polynomial.
-        if ecCount in rsPoly_LUT:
-            rsPoly = Polynomial(rsPoly_LUT[ecCount], 0)
-        else:
-            rsPoly = Polynomial([1], 0)
-            for i in range(ecCount):
-                rsPoly = rsPoly * Polynomial([1, gexp(i)], 0)
-
-        rawPoly = Polynomial(dcdata[r], len(rsPoly) - 1)
-
-        modPoly = rawPoly % rsPoly
-        ecdata[r] = [0] * (len(rsPoly) - 1)
-        for i in range(len(ecdata[r])):
-            modIndex = i + len(modPoly) - len(ecdata[r])
-            if (modIndex >= 0):
-                ecdata[r][i] = modPoly[modIndex]
-            else:
-                ecdata[r][i] = 0
+        ecdata[r] = bytearray(ecCount)
+        _rs_remainder(dcdata[r], dcCount, rs_generator(ecCount), ecCount, ecdata[r])
 
     totalCodeCount = 0
     for rs_block in rs_blocks:
         totalCodeCount += rs_block.total_count
 
-    data = [None] * totalCodeCount
+    data = bytearray(totalCodeCount)
     index = 0
 
     for i in range(maxDcCount):
@@ -928,7 +827,7 @@ def create_data(version, error_correction, data_list):
         bit_limit += block.data_count * 8
 
     if len(buffer) > bit_limit:
-        raise exceptions.DataOverflowError(
+        raise DataOverflowError(
             "Code length overflow. Data size (%s) > size available (%s)" %
             (len(buffer), bit_limit))
 
@@ -1002,6 +901,7 @@ class QRCode:
         self.border = int(border)
         _check_mask_pattern(mask_pattern)
         self.mask_pattern = mask_pattern
+        self._fversion = 0  # Version of the function pattern template
 
         self.clear()
 
@@ -1013,6 +913,7 @@ class QRCode:
         self.modules_count = 0
         self.data_cache = None
         self.data_list = []
+        self._dsrc = None  # data_cache placed in the unmasked matrix
 
     def add_data(self, data, optimize=20):
         """
@@ -1048,48 +949,102 @@ class QRCode:
 
     def makeImpl(self, test, mask_pattern):
         _check_version(self.version)
-        self.modules_count = self.version * 4 + 17
-        self.modules = [None] * self.modules_count
-
-        for row in range(self.modules_count):
-
-            self.modules[row] = [None] * self.modules_count
-
-            for col in range(self.modules_count):
-                self.modules[row][col] = None   # (col + row) % 3
-
-        self.setup_position_probe_pattern(0, 0)
-        self.setup_position_probe_pattern(self.modules_count - 7, 0)
-        self.setup_position_probe_pattern(0, self.modules_count - 7)
-        self.setup_position_adjust_pattern()
-        self.setup_timing_pattern()
-        self.setup_type_info(test, mask_pattern)
-
-        if self.version >= 7:
-            self.setup_type_number(test)
+        if self._fversion != self.version:
+            self._setup()
+        n = self.version * 4 + 17
+        if self.modules_count != n:
+            self.modules_count = n
+            self.modules = bytearray(n * n)
 
         if self.data_cache is None:
             self.data_cache = create_data(
                 self.version, self.error_correction, self.data_list)
-        self.map_data(self.data_cache, mask_pattern)
-
-    def setup_position_probe_pattern(self, row, col):
-        for r in range(-1, 8):
-
-            if row + r <= -1 or self.modules_count <= row + r:
-                continue
-
-            for c in range(-1, 8):
-
-                if col + c <= -1 or self.modules_count <= col + c:
+        if self._dsrc is not self.data_cache:  # Place data: mask is applied later
+            self._dsrc = self.data_cache
+            self._unmasked[:] = self._base
+            _map_data(self._unmasked, self._fn, n, self.data_cache, len(self.data_cache))
+
+        modules = self.modules
+        modules[:] = self._unmasked
+        _apply_mask(modules, self._fn, n, mask_pattern)
+        if not test:  # Format and version information. Zero in test mode.
+            bits = BCH_type_info((self.error_correction << 3) | mask_pattern)
+            for i in range(15):
+                mod = (bits >> i) & 1
+                modules[self._tinfo[i]] = mod
+                modules[self._tinfo[i + 15]] = mod
+            modules[(n - 8) * n + 8] = 1  # Fixed dark module
+            if self.version >= 7:
+                bits = BCH_type_number(self.version)
+                for i in range(18):
+                    mod = (bits >> i) & 1
+                    modules[(i // 3) * n + i % 3 + n - 11] = mod
+                    modules[(i % 3 + n - 11) * n + i // 3] = mod
+
+    # Create the template of function patterns for the current version. The
+    # format and version information areas are reserved with light modules.
+    def _setup(self):
+        n = self.version * 4 + 17
+        self._unmasked = bytearray(n * n)
+        self._dsrc = None
+        base = bytearray(n * n)
+        fn = bytearray(n * n)
+        self._base = base
+        self._fn = fn
+
+        def put(row, col, dark):
+            base[row * n + col] = dark
+            fn[row * n + col] = 1
+
+        # Position probe patterns with separators
+        for row, col in ((0, 0), (n - 7, 0), (0, n - 7)):
+            for r in range(-1, 8):
+                if row + r <= -1 or n <= row + r:
                     continue
+                for c in range(-1, 8):
+                    if col + c <= -1 or n <= col + c:
+                        continue
+                    put(row + r, col + c,
+                        0 <= r <= 6 and (c == 0 or c == 6)
+                        or (0 <= c <= 6 and (r == 0 or r == 6))
+                        or (2 <= r <= 4 and 2 <= c <= 4))
+
+        # Position adjust patterns
+        pos = pattern_position(self.version)
+        for row in pos:
+            for col in pos:
+                if fn[row * n + col]:
+                    continue
+                for r in range(-2, 3):
+                    for c in range(-2, 3):
+                        put(row + r, col + c,
+                            r == -2 or r == 2 or c == -2 or c == 2 or (r == 0 and c == 0))
+
+        # Timing patterns
+        for i in range(8, n - 8):
+            if not fn[i * n + 6]:
+                put(i, 6, i % 2 == 0)
+            if not fn[6 * n + i]:
+                put(6, i, i % 2 == 0)
+
+        # Format information: module indices of bit i are _tinfo[i] (vertical)
+        # and _tinfo[i + 15] (horizontal).
+        tinfo = []
+        for i in range(15):
+            tinfo.append((i if i < 6 else i + 1 if i < 8 else n - 15 + i) * n + 8)
+        for i in range(15):
+            tinfo.append(8 * n + (n - i - 1 if i < 8 else 15 - i if i < 9 else 14 - i))
+        for p in tinfo:
+            fn[p] = 1
+        fn[(n - 8) * n + 8] = 1
+        self._tinfo = tinfo
 
-                if (0 <= r and r <= 6 and (c == 0 or c == 6)
-                        or (0 <= c and c <= 6 and (r == 0 or r == 6))
-                        or (2 <= r and r <= 4 and 2 <= c and c <= 4)):
-                    self.modules[row + r][col + c] = True
-                else:
-                    self.modules[row + r][col + c] = False
+        # Version information
+        if self.version >= 7:
+            for i in range(18):
+                fn[(i // 3) * n + i % 3 + n - 11] = 1
+                fn[(i % 3 + n - 11) * n + i // 3] = 1
+        self._fversion = self.version
 
     def best_fit(self, start=None):
         """
@@ -1134,9 +1089,7 @@ class QRCode:
         pattern = 0
 
         for i in range(8):
-            self.makeImpl(True, i)
-
-            lost_point = make_lost_point(self.modules)
+            lost_point = self._mask_score(i)
 
             if i == 0 or min_lost_point > lost_point:
                 min_lost_point = lost_point
@@ -1144,127 +1097,33 @@ class QRCode:
 
         return pattern
 
+    def _mask_score(self, mask_pattern):
+        self.makeImpl(True, mask_pattern)
+        return make_lost_point(self.modules, self.modules_count)
 
-    def setup_timing_pattern(self):
-        for r in range(8, self.modules_count - 8):
-            if self.modules[r][6] is not None:
-                continue
-            self.modules[r][6] = (r % 2 == 0)
-
-        for c in range(8, self.modules_count - 8):
-            if self.modules[6][c] is not None:
-                continue
-            self.modules[6][c] = (c % 2 == 0)
-
-    def setup_position_adjust_pattern(self):
-        pos = pattern_position(self.version)
-
-        for i in range(len(pos)):
-
-            for j in range(len(pos)):
-
-                row = pos[i]
-                col = pos[j]
-
-                if self.modules[row][col] is not None:
-                    continue
-
-                for r in range(-2, 3):
-
-                    for c in range(-2, 3):
-
-                        if (r == -2 or r == 2 or c == -2 or c == 2 or
-                                (r == 0 and c == 0)):
-                            self.modules[row + r][col + c] = True
-                        else:
-                            self.modules[row + r][col + c] = False
-
-    def setup_type_number(self, test):
-        bits = BCH_type_number(self.version)
-
-        for i in range(18):
-            mod = (not test and ((bits >> i) & 1) == 1)
-            self.modules[i // 3][i % 3 + self.modules_count - 8 - 3] = mod
-
-        for i in range(18):
-            mod = (not test and ((bits >> i) & 1) == 1)
-            self.modules[i % 3 + self.modules_count - 8 - 3][i // 3] = mod
-
-    def setup_type_info(self, test, mask_pattern):
-        data = (self.error_correction << 3) | mask_pattern
-        bits = BCH_type_info(data)
-
-        # vertical
-        for i in range(15):
-
-            mod = (not test and ((bits >> i) & 1) == 1)
-
-            if i < 6:
-                self.modules[i][8] = mod
-            elif i < 8:
-                self.modules[i + 1][8] = mod
-            else:
-                self.modules[self.modules_count - 15 + i][8] = mod
-
-        # horizontal
-        for i in range(15):
-
-            mod = (not test and ((bits >> i) & 1) == 1)
-
-            if i < 8:
-                self.modules[8][self.modules_count - i - 1] = mod
-            elif i < 9:
-                self.modules[8][15 - i - 1 + 1] = mod
-            else:
-                self.modules[8][15 - i - 1] = mod
-
-        # fixed module
-        self.modules[self.modules_count - 8][8] = (not test)
-
-    def map_data(self, data, mask_pattern):
-        inc = -1
-        row = self.modules_count - 1
-        bitIndex = 7
-        byteIndex = 0
-
-        mask_func = make_mask_func(mask_pattern)
-
-        data_len = len(data)
-
-        for col in range(self.modules_count - 1, 0, -2):
-
-            if col <= 6:
-                col -= 1
-
-            col_range = (col, col-1)
-
-            while True:
-
-                for c in col_range:
-
-                    if self.modules[row][c] is None:
-
-                        dark = False
-
-                        if byteIndex < data_len:
-                            dark = (((data[byteIndex] >> bitIndex) & 1) == 1)
-
-                        if mask_func(row, c):
-                            dark = not dark
-
-                        self.modules[row][c] = dark
-                        bitIndex -= 1
-
-                        if bitIndex == -1:
-                            byteIndex += 1
-                            bitIndex = 7
-
-                row += inc
+    async def make_async(self, fit=True):
+        """
+        As make() but yields to the scheduler between stages: data encoding
+        and error correction, then evaluation of each mask pattern.
+        """
+        if fit or (self.version is None):
+            self.best_fit(start=self.version)
+            await asyncio.sleep(0)
+        if self.data_cache is None:
+            self.data_cache = create_data(
+                self.version, self.error_correction, self.data_list)
+            await asyncio.sleep(0)
+        pattern = self.mask_pattern
+        if pattern is None:
+            min_lost_point = 0
+            for i in range(8):
+                lost_point = self._mask_score(i)
+                if i == 0 or min_lost_point > lost_point:
+                    min_lost_point = lost_point
+                    pattern = i
+                await asyncio.sleep(0)
+        self.makeImpl(False, pattern)
 
-                if row < 0 or self.modules_count <= row:
-                    row -= inc
-                    inc = -inc
-                    break
 
     def get_matrix(self):
         """
@@ -1275,13 +1134,15 @@ class QRCode:
         if self.data_cache is None:
             self.make()
 
+        n = self.modules_count
+        modules = [[x == 1 for x in self.modules[r : r + n]] for r in range(0, n * n, n)]
         if not self.border:
-            return self.modules
+            return modules
 
-        width = len(self.modules) + self.border*2
+        width = n + self.border*2
         code = [[False]*width] * self.border
         x_border = [False]*self.border
-        for module in self.modules:
+        for module in modules:
             code.append(x_border + module + x_border)
         code += [[False]*width] * self.border
 